@@ -0,0 +1 @@
+"""Benchmarks de Versao_NP, Versao_P e dos modos do pacote metas."""
@@ -0,0 +1,99 @@
+"""Executa Versao_NP, Versao_P e os modos do pacote metas sobre uma matriz de tamanhos.
+
+Para cada tamanho os dados sintéticos são gerados uma vez numa pasta
+temporária; cada configuração roda como subprocesso nessa pasta e o tempo
+de parede, o maior pico de RSS entre o processo e seus workers (o pico de
+um só processo, não a soma) e as linhas por segundo são gravados em JSON.
+
+    python -m benchmarks.executar --linhas 1000 100000 --workers 1 8 --saida bench.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.gerar_dados import gerar_dados
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# nome -> (script, argumentos, usa --workers)
+CONFIGURACOES = {
+    'NP': ('Versao_NP.py', [], False),
+    'NP-streaming': ('Versao_NP.py', ['--streaming'], False),
+    'P': ('Versao_P.py', [], True),
+    'P-streaming': ('Versao_P.py', ['--streaming'], True),
+    'P-partes': ('Versao_P.py', ['--partes-nos-workers'], True),
+    'P-balanceado': ('Versao_P.py', ['--balanceado'], True),
+    'threads': ('Versao_P.py', ['--executor', 'threads'], True),
+    'threads-balanceado': ('Versao_P.py', ['--executor', 'threads', '--balanceado'], True),
+    'P-apenas-metas': ('Versao_P.py', ['--apenas-metas'], True),
+    'P-apenas-resumo': ('Versao_P.py', ['--apenas-metas', '--sem-grafico'], True),
+    'P-grafico-svg': ('Versao_P.py', ['--formato-grafico', 'svg'], True),
+}
+
+
+def medir(comando, pasta):
+    """Roda o comando em pasta e retorna (segundos, maior pico de RSS de um processo em MB, código de saída).
+
+    O ru_maxrss de wait4 é o máximo entre o processo e os filhos que ele
+    esperou, não a memória somada de todos ao mesmo tempo.
+    """
+    inicio = time.perf_counter()
+    with open(os.devnull, 'w') as nulo:
+        processo = subprocess.Popen(comando, cwd=pasta, stdout=nulo, stderr=subprocess.STDOUT)
+        _, status, uso = os.wait4(processo.pid, 0)
+    segundos = time.perf_counter() - inicio
+    # ru_maxrss vem em KB no Linux e em bytes no macOS.
+    divisor = 1024 ** 2 if sys.platform == 'darwin' else 1024
+    return segundos, uso.ru_maxrss / divisor, os.waitstatus_to_exitcode(status)
+
+
+def executar(linhas, num_tribunais, workers, configuracoes, repeticoes=1, semente=0):
+    """Roda a matriz e retorna a lista de registros."""
+    registros = []
+    for linhas_por_tribunal in linhas:
+        with tempfile.TemporaryDirectory(prefix='bench_metas_') as pasta:
+            total = gerar_dados(os.path.join(pasta, 'Dados'), linhas_por_tribunal, num_tribunais, semente)
+            for nome in configuracoes:
+                script, argumentos, usa_workers = CONFIGURACOES[nome]
+                for n in (workers if usa_workers else [None]):
+                    comando = [sys.executable, os.path.join(RAIZ, script), *argumentos]
+                    if n is not None:
+                        comando += ['--workers', str(n)]
+                    for repeticao in range(repeticoes):
+                        segundos, maior_rss_mb, codigo = medir(comando, pasta)
+                        registro = {
+                            'configuracao': nome, 'linhas_por_tribunal': linhas_por_tribunal,
+                            'tribunais': num_tribunais, 'linhas': total, 'workers': n,
+                            'repeticao': repeticao, 'segundos': round(segundos, 4),
+                            'maior_rss_processo_mb': round(maior_rss_mb, 1),
+                            'linhas_por_segundo': round(total / segundos, 1) if segundos else None,
+                            'codigo_saida': codigo,
+                        }
+                        print(f"{nome:18} linhas={total:>10} workers={n or '-':>3} "
+                              f"{segundos:8.3f}s {maior_rss_mb:8.1f} MB")
+                        registros.append(registro)
+    return registros
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark das versões do cálculo de metas.")
+    parser.add_argument('--linhas', type=int, nargs='+', default=[1_000, 10_000],
+                        help="Linhas por tribunal; uma rodada por valor.")
+    parser.add_argument('--tribunais', type=int, default=20)
+    parser.add_argument('--workers', type=int, nargs='+', default=[os.cpu_count()],
+                        help="Tamanhos de pool testados nas configurações paralelas.")
+    parser.add_argument('--configuracoes', nargs='+', default=list(CONFIGURACOES), choices=list(CONFIGURACOES))
+    parser.add_argument('--repeticoes', type=int, default=1)
+    parser.add_argument('--semente', type=int, default=0)
+    parser.add_argument('--saida', default='benchmark_metas.json')
+    args = parser.parse_args()
+    registros = executar(args.linhas, args.tribunais, args.workers, args.configuracoes, args.repeticoes, args.semente)
+    with open(args.saida, 'w', encoding='utf-8') as f:
+        json.dump({'python': platform.python_version(), 'cpus': os.cpu_count(), 'resultados': registros},
+                  f, ensure_ascii=False, indent=2)
+    print(f"Resultados gravados em '{args.saida}'.")
@@ -0,0 +1,94 @@
+"""Gera arquivos Dados/teste_<sigla>.csv sintéticos para os benchmarks.
+
+Cada arquivo traz todas as colunas usadas pelas metas (julgados/casos novos
+de 2025 e os julgm*/distm*/suspm* de cada meta) com valores coerentes entre
+si: julgados e suspensos são frações dos distribuídos. Os tribunais são
+escolhidos alternando entre os ramos, para que todos apareçam mesmo com
+poucos tribunais.
+"""
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from metas.motor import COLUNAS_METAS
+
+UFS = ['AC', 'AL', 'AM', 'AP', 'BA', 'CE', 'DF', 'ES', 'GO', 'MA', 'MG', 'MS', 'MT', 'PA',
+       'PB', 'PE', 'PI', 'PR', 'RJ', 'RN', 'RO', 'RR', 'RS', 'SC', 'SE', 'SP', 'TO']
+
+TRIBUNAIS_POR_RAMO = {
+    'Justiça Estadual': [f"TJ{uf}" for uf in UFS],
+    'Justiça Eleitoral': [f"TRE-{uf}" for uf in UFS],
+    'Justiça do Trabalho': [f"TRT{i}" for i in range(1, 25)],
+    'Justiça Federal': [f"TRF{i}" for i in range(1, 7)],
+    'Justiça Militar da União': ['STM'],
+    'Justiça Militar Estadual': ['TJMMG', 'TJMSP', 'TJMRS'],
+    'Tribunais Superiores': ['STJ', 'TST'],
+}
+
+
+def escolher_tribunais(num_tribunais):
+    """Retorna até num_tribunais pares (sigla, ramo), alternando entre os ramos."""
+    filas = [[(sigla, ramo) for sigla in siglas] for ramo, siglas in TRIBUNAIS_POR_RAMO.items()]
+    escolhidos = []
+    while len(escolhidos) < num_tribunais and any(filas):
+        for fila in filas:
+            if fila and len(escolhidos) < num_tribunais:
+                escolhidos.append(fila.pop(0))
+    return escolhidos
+
+
+def gerar_tribunal(sigla, ramo, linhas, rng, fracao_invalida=0.0):
+    """Monta o DataFrame de um tribunal com linhas processos."""
+    dados = {
+        'sigla_tribunal': np.full(linhas, sigla, dtype=object),
+        'ramo_justica': np.full(linhas, ramo, dtype=object),
+        'sigla_grau': rng.choice(['G1', 'G2', 'JE', 'TR'], size=linhas),
+        'id_orgao_julgador': rng.integers(1, 5000, size=linhas),
+    }
+    casos_novos = rng.poisson(40, size=linhas)
+    dados['casos_novos_2025'] = casos_novos
+    dados['dessobrestados_2025'] = rng.poisson(2, size=linhas)
+    dados['suspensos_2025'] = rng.binomial(casos_novos, 0.05)
+    dados['julgados_2025'] = rng.binomial(casos_novos + dados['dessobrestados_2025'], 0.9)
+    for coluna in COLUNAS_METAS:
+        if coluna.startswith('distm'):
+            sufixo = coluna[len('distm'):]
+            distribuidos = rng.poisson(20, size=linhas)
+            dados[coluna] = distribuidos
+            dados[f"suspm{sufixo}"] = rng.binomial(distribuidos, 0.05)
+            dados[f"julgm{sufixo}"] = rng.binomial(distribuidos, 0.6)
+    df = pd.DataFrame(dados)
+    if fracao_invalida > 0:
+        for coluna in COLUNAS_METAS:
+            invalidas = rng.random(linhas) < fracao_invalida
+            if invalidas.any():
+                df[coluna] = df[coluna].astype(object)
+                df.loc[invalidas, coluna] = rng.choice(['', 'NA', 'x'], size=int(invalidas.sum()))
+    return df
+
+
+def gerar_dados(pasta, linhas_por_tribunal, num_tribunais, semente=0, fracao_invalida=0.0):
+    """Escreve um teste_<sigla>.csv por tribunal em pasta e retorna o total de linhas."""
+    os.makedirs(pasta, exist_ok=True)
+    rng = np.random.default_rng(semente)
+    total = 0
+    for sigla, ramo in escolher_tribunais(num_tribunais):
+        df = gerar_tribunal(sigla, ramo, linhas_por_tribunal, rng, fracao_invalida)
+        df.to_csv(os.path.join(pasta, f"teste_{sigla}.csv"), index=False, encoding='utf-8')
+        total += len(df)
+    return total
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Gera dados sintéticos no formato de Dados/.")
+    parser.add_argument('pasta', nargs='?', default='Dados')
+    parser.add_argument('--linhas', type=int, default=10_000, help="Linhas por tribunal.")
+    parser.add_argument('--tribunais', type=int, default=20, help="Número de tribunais.")
+    parser.add_argument('--semente', type=int, default=0)
+    parser.add_argument('--fracao-invalida', type=float, default=0.0,
+                        help="Fração de células das metas substituídas por valores inválidos.")
+    args = parser.parse_args()
+    total = gerar_dados(args.pasta, args.linhas, args.tribunais, args.semente, args.fracao_invalida)
+    print(f"{total} linhas geradas em '{args.pasta}'.")
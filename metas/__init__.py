@@ -0,0 +1 @@
+"""Cálculo das Metas Nacionais do CNJ a partir dos arquivos em Dados/."""
@@ -0,0 +1,5 @@
+"""Permite `python -m metas --executor sequential|processes|threads`."""
+from metas.cli import main
+
+if __name__ == '__main__':
+    main()
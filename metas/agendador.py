@@ -0,0 +1,134 @@
+"""Agendamento balanceado do processamento paralelo.
+
+Em vez de uma tarefa por tribunal, o trabalho é dividido em subtarefas de
+custo parecido, estimado pelo tamanho dos arquivos: tribunais com vários
+arquivos viram uma subtarefa por arquivo e arquivos grandes são fatiados em
+faixas de bytes alinhadas ao início das linhas. As subtarefas são entregues
+das maiores para as menores com imap_unordered e as somas parciais são
+combinadas depois, na ordem original.
+
+O fatiamento supõe que nenhum campo entre aspas contém quebra de linha.
+Cada subtarefa grava sua parte do consolidado com os tipos inferidos nas
+suas próprias linhas, então um inteiro pode sair como '40' onde o modo
+padrão escreve '40.0'.
+"""
+import io
+import os
+from collections import namedtuple
+from functools import partial
+
+from metas.instrumentacao import etapa
+from metas.motor import resolver_ramo, somar_por_tribunal
+from metas.ingestao import ler_csv
+from metas.saida import Saida
+
+FATIAS_POR_WORKER = 4
+TAMANHO_MINIMO_FATIA = 8 * 1024 ** 2
+
+# inicio/fim são None quando a subtarefa cobre o arquivo inteiro.
+Subtarefa = namedtuple('Subtarefa', 'ordem sigla arquivo inicio fim custo')
+
+
+def planejar(tarefas, workers, fatias_por_worker=FATIAS_POR_WORKER, tamanho_minimo=TAMANHO_MINIMO_FATIA):
+    """Divide as tarefas (sigla, arquivos) em subtarefas de custo próximo de total / (workers * fatias_por_worker)."""
+    tamanhos = {arquivo: os.path.getsize(arquivo) for _, arquivos in tarefas for arquivo in arquivos}
+    alvo = max(tamanho_minimo, sum(tamanhos.values()) // max(1, workers * fatias_por_worker))
+    subtarefas = []
+    for sigla, arquivos in tarefas:
+        for arquivo in arquivos:
+            tamanho = tamanhos[arquivo]
+            fatias = max(1, -(-tamanho // alvo))
+            if fatias == 1:
+                subtarefas.append(Subtarefa(len(subtarefas), sigla, arquivo, None, None, tamanho))
+                continue
+            for i in range(fatias):
+                inicio, fim = tamanho * i // fatias, tamanho * (i + 1) // fatias
+                subtarefas.append(Subtarefa(len(subtarefas), sigla, arquivo, inicio, fim, fim - inicio))
+    return subtarefas
+
+
+def _alinhar(f, posicao, inicio_dados, tamanho):
+    """Avança a posição até o início da próxima linha completa."""
+    if posicao <= inicio_dados:
+        return inicio_dados
+    if posicao >= tamanho:
+        return tamanho
+    f.seek(posicao - 1)
+    f.readline()
+    return f.tell()
+
+
+def ler_faixa(arquivo, inicio, fim, apenas_metas=False):
+    """Lê as linhas do CSV que começam na faixa de bytes [inicio, fim), com o cabeçalho do arquivo."""
+    tamanho = os.path.getsize(arquivo)
+    with open(arquivo, 'rb') as f:
+        cabecalho = f.readline()
+        inicio = _alinhar(f, inicio, len(cabecalho), tamanho)
+        fim = _alinhar(f, fim, len(cabecalho), tamanho)
+        f.seek(inicio)
+        dados = f.read(max(0, fim - inicio))
+    return ler_csv(io.BytesIO(cabecalho + dados), apenas_metas=apenas_metas)
+
+
+def caminho_parte(pasta_partes, subtarefa):
+    """Arquivo-parte do consolidado escrito pela subtarefa."""
+    return os.path.join(pasta_partes, f"{subtarefa.ordem:06d}.csv")
+
+
+def processar_subtarefa(subtarefa, ler=ler_csv, colunas=None, pasta_partes=None, saida=None):
+    """Lê e soma uma subtarefa; retorna (ordem, (somas, ramos)) ou (ordem, None) se nada foi somado.
+
+    Erros de leitura sobem para o executor, como nos workers de metas.tarefas.
+    """
+    if saida is None:
+        saida = Saida.criar()
+    with etapa('leitura', subtarefa.sigla) as medida:
+        if subtarefa.inicio is None:
+            df = ler(subtarefa.arquivo)
+        else:
+            df = ler_faixa(subtarefa.arquivo, subtarefa.inicio, subtarefa.fim)
+        medida['linhas'], medida['bytes_lidos'] = len(df), subtarefa.custo
+    if df.empty:
+        return subtarefa.ordem, None
+    ramo = df['ramo_justica'].iloc[0]
+    if resolver_ramo(ramo, subtarefa.sigla) is None:
+        print(f"    - Aviso: Nenhuma função de cálculo definida para '{ramo}'. Tribunal '{subtarefa.sigla}' ignorado.")
+        return subtarefa.ordem, None
+    faixa = '' if subtarefa.inicio is None else f", bytes {subtarefa.inicio}-{subtarefa.fim}"
+    print(f"  - Processando: {subtarefa.sigla} ({os.path.basename(subtarefa.arquivo)}{faixa})")
+    if pasta_partes is not None:
+        with etapa('escrita_parte', subtarefa.sigla) as medida, \
+                saida.abrir_parte(caminho_parte(pasta_partes, subtarefa), colunas) as escritor:
+            escritor.escrever(df)
+            medida['linhas'] = len(df)
+    with etapa('soma', subtarefa.sigla) as medida:
+        somas = somar_por_tribunal(df)
+        medida['linhas'] = len(df)
+    return subtarefa.ordem, somas
+
+
+def executar_balanceado(tarefas, pool, workers, ler=ler_csv, colunas=None, pasta_partes=None, saida=None):
+    """Executa as subtarefas no pool (ver metas.executores), maiores primeiro.
+
+    Retorna (somas_parciais, partes): as somas na ordem original das tarefas
+    e a lista de arquivos-parte a juntar com saida.juntar_partes(). Com um
+    executor metas.executores.Tolerante, um tribunal com alguma subtarefa
+    que falhou de vez sai inteiro das somas e do consolidado, em vez de
+    entrar com só uma parte das linhas.
+    """
+    if saida is None:
+        saida = Saida.criar()
+    subtarefas = planejar(tarefas, workers)
+    fila = sorted(subtarefas, key=lambda s: s.custo, reverse=True)
+    resultados = [None] * len(subtarefas)
+    worker = partial(processar_subtarefa, ler=ler, colunas=colunas, pasta_partes=pasta_partes, saida=saida)
+    for ordem, resultado in pool.imap_unordered(worker, fila, chunksize=1):
+        resultados[ordem] = resultado
+    com_falha = {fila[falha.indice].sigla for falha in getattr(pool, 'falhas', ())}
+    for subtarefa in subtarefas:
+        if subtarefa.sigla in com_falha:
+            resultados[subtarefa.ordem] = None
+            if pasta_partes is not None:
+                saida.descartar_parte(caminho_parte(pasta_partes, subtarefa))
+    partes = [caminho_parte(pasta_partes, s) for s in subtarefas] if pasta_partes is not None else []
+    return [r for r in resultados if r is not None], partes
@@ -0,0 +1,43 @@
+"""Leitura dos arquivos de Dados/ em blocos de tamanho fixo.
+
+No modo streaming nenhum arquivo é carregado inteiro: cada bloco é somado por
+tribunal e, se houver saída, entregue ao escritor do consolidado antes do
+próximo ser lido. O pico de memória passa a depender do tamanho do bloco,
+não dos dados.
+"""
+from metas.motor import somar_por_tribunal, combinar_somas
+from metas.ingestao import ler_cabecalho, ler_csv_em_blocos
+from metas.padroes import TAMANHO_BLOCO_PADRAO
+
+
+def cabecalho_consolidado(arquivos):
+    """União das colunas de todos os arquivos, na mesma ordem que pd.concat produziria."""
+    return list(dict.fromkeys(coluna for arquivo in arquivos for coluna in ler_cabecalho(arquivo)))
+
+
+def cabecalho_do_tribunal(tarefa):
+    """Colunas dos arquivos de uma tarefa (sigla, arquivos), para ler os cabeçalhos no executor."""
+    _, arquivos = tarefa
+    return cabecalho_consolidado(arquivos)
+
+
+def somar_em_blocos(arquivos, tamanho_bloco=TAMANHO_BLOCO_PADRAO, escritor=None, filtro_ramo=None):
+    """Soma as colunas das metas por tribunal lendo os arquivos bloco a bloco.
+
+    Se escritor (um EscritorConsolidado) for informado, cada bloco é anexado
+    ao consolidado por ele. filtro_ramo, se informado, é
+    chamado com (ramo, sigla) do primeiro bloco; se retornar False a leitura é
+    interrompida e nada é somado nem escrito. Retorna (somas, ramos) como
+    somar_por_tribunal.
+    """
+    acumulado = combinar_somas([])
+    for arquivo in arquivos:
+        for bloco in ler_csv_em_blocos(arquivo, tamanho_bloco, apenas_metas=escritor is None):
+            if filtro_ramo is not None:
+                if bloco.empty or not filtro_ramo(bloco['ramo_justica'].iloc[0], bloco['sigla_tribunal'].iloc[0]):
+                    return combinar_somas([])
+                filtro_ramo = None
+            acumulado = combinar_somas([acumulado, somar_por_tribunal(bloco)])
+            if escritor is not None:
+                escritor.escrever(bloco)
+    return acumulado
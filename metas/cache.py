@@ -0,0 +1,123 @@
+"""Cache em Parquet dos CSVs de Dados/ já lidos.
+
+Cada arquivo lido é guardado em uma entrada cujo nome carrega o caminho, o
+tamanho e o mtime do CSV de origem; se algum deles mudar a entrada deixa de
+ser encontrada e o CSV é lido de novo. O mtime da própria entrada marca o
+último uso e serve para o despejo LRU quando a pasta passa do limite.
+"""
+import glob
+import hashlib
+import os
+import shutil
+import threading
+from functools import partial
+
+import pandas as pd
+
+from metas.ingestao import COLUNAS_LEITURA_METAS, aplicar_esquema, ler_csv
+from metas.padroes import PASTA_CACHE_PADRAO, LIMITE_CACHE_PADRAO
+
+try:
+    import pyarrow.parquet as pq
+    PARQUET_DISPONIVEL = True
+except ImportError:
+    PARQUET_DISPONIVEL = False
+
+
+def _prefixo_entrada(pasta, arquivo):
+    chave = hashlib.sha1(os.path.realpath(arquivo).encode('utf-8')).hexdigest()
+    return os.path.join(pasta, chave)
+
+
+def _caminho_entrada(pasta, arquivo):
+    """Caminho da entrada para o estado atual do CSV (chave = caminho, tamanho e mtime)."""
+    info = os.stat(arquivo)
+    return f"{_prefixo_entrada(pasta, arquivo)}-{info.st_size}-{info.st_mtime_ns}.parquet"
+
+
+def _ler_entrada(entrada, apenas_metas):
+    if apenas_metas:
+        colunas = [coluna for coluna in pq.read_schema(entrada).names if coluna in COLUNAS_LEITURA_METAS]
+        return aplicar_esquema(pd.read_parquet(entrada, columns=colunas, memory_map=True))
+    return pd.read_parquet(entrada, memory_map=True)
+
+
+def _gravar_entrada(pasta, arquivo, entrada, df):
+    os.makedirs(pasta, exist_ok=True)
+    for antiga in glob.glob(f"{_prefixo_entrada(pasta, arquivo)}-*.parquet"):
+        try:
+            os.remove(antiga)
+        except FileNotFoundError:
+            pass
+    temporario = f"{entrada}.{os.getpid()}-{threading.get_ident()}.tmp"
+    df.to_parquet(temporario, index=False)
+    os.replace(temporario, entrada)
+
+
+def despejar_lru(pasta=PASTA_CACHE_PADRAO, limite_bytes=LIMITE_CACHE_PADRAO):
+    """Remove as entradas usadas há mais tempo até a pasta caber em limite_bytes."""
+    entradas = []
+    for entrada in glob.glob(os.path.join(pasta, '*.parquet')):
+        try:
+            info = os.stat(entrada)
+        except FileNotFoundError:
+            continue
+        entradas.append((info.st_mtime_ns, info.st_size, entrada))
+    total = sum(tamanho for _, tamanho, _ in entradas)
+    for _, tamanho, entrada in sorted(entradas):
+        if total <= limite_bytes:
+            break
+        try:
+            os.remove(entrada)
+        except FileNotFoundError:
+            pass
+        total -= tamanho
+
+
+def limpar_cache(pasta=PASTA_CACHE_PADRAO):
+    """Apaga todas as entradas do cache (usado por --rebuild-cache)."""
+    shutil.rmtree(pasta, ignore_errors=True)
+
+
+def ler_csv_em_cache(arquivo, pasta=PASTA_CACHE_PADRAO, limite_bytes=LIMITE_CACHE_PADRAO, apenas_metas=False):
+    """Lê o CSV pelo cache quando ele não mudou; caso contrário lê o CSV e atualiza o cache.
+
+    A entrada guarda sempre o arquivo completo, então serve tanto para o
+    consolidado quanto para leituras apenas_metas, que carregam só as colunas
+    necessárias do Parquet.
+    """
+    if not PARQUET_DISPONIVEL:
+        return ler_csv(arquivo, apenas_metas=apenas_metas)
+    entrada = _caminho_entrada(pasta, arquivo)
+    if os.path.exists(entrada):
+        try:
+            df = _ler_entrada(entrada, apenas_metas)
+            os.utime(entrada)
+            return df
+        except (OSError, ValueError):
+            # Entrada despejada ou corrompida por outro processo: cai para o CSV.
+            pass
+    df = ler_csv(arquivo)
+    try:
+        _gravar_entrada(pasta, arquivo, entrada, df)
+        despejar_lru(pasta, limite_bytes)
+    except OSError as e:
+        print(f"    - Aviso: não foi possível gravar '{arquivo}' no cache: {e}")
+    return aplicar_esquema(df[[c for c in df.columns if c in COLUNAS_LEITURA_METAS]].copy()) if apenas_metas else df
+
+
+def leitor_csv(usar_cache=False, pasta=PASTA_CACHE_PADRAO, limite_bytes=LIMITE_CACHE_PADRAO):
+    """Retorna a função de leitura a usar: ler_csv direto ou através do cache.
+
+    Com o cache, a pasta já é reduzida a limite_bytes aqui: numa execução em
+    que tudo vem do cache nada é gravado, e um limite menor que o da execução
+    anterior não teria efeito. O resultado pode ser enviado aos workers do
+    multiprocessing.
+    """
+    if not usar_cache:
+        return ler_csv
+    if not PARQUET_DISPONIVEL:
+        print("Aviso: pyarrow não está instalado; o cache Parquet foi desativado.")
+        return ler_csv
+    despejar_lru(pasta, limite_bytes)
+    return partial(ler_csv_em_cache, pasta=pasta, limite_bytes=limite_bytes)
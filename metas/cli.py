@@ -0,0 +1,151 @@
+"""Linha de comando comum a `python -m metas`, Versao_NP.py e Versao_P.py."""
+import argparse
+import cProfile
+import sys
+
+from metas.executores import EXECUTORES, EXECUTOR_PADRAO
+from metas.padroes import (TAMANHO_BLOCO_PADRAO, PASTA_CACHE_PADRAO, LIMITE_CACHE_PADRAO,
+                           ESTADO_PADRAO, FORMATOS_SAIDA, FORMATOS_GRAFICO, HISTORICO_PADRAO,
+                           INDICE_PADRAO, TENTATIVAS_PADRAO, TAREFAS_POR_WORKER_PADRAO)
+from metas.historico import validar_periodo, imprimir_consulta
+from metas.indice import reindexar
+from metas.consulta import calcular
+from metas.pipeline import executar, graficos_do_resumo
+from metas.vigia import INTERVALO_PADRAO, vigiar
+
+
+CONSULTAS_HISTORICO = ('serie', 'ranking', 'variacao')
+
+
+def _periodo(texto):
+    try:
+        return validar_periodo(texto)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def criar_parser(descricao="Calcula as metas dos tribunais.", executor=EXECUTOR_PADRAO):
+    parser = argparse.ArgumentParser(description=descricao)
+    parser.add_argument('--executor', default=executor, choices=EXECUTORES,
+                        help=f"Como as tarefas por tribunal são executadas (padrão: {executor}). "
+                             "Os resultados são idênticos com qualquer executor.")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Número de processos ou threads do executor (padrão: número de CPUs).")
+    parser.add_argument('--timeout', type=float, default=None,
+                        help="Segundos que a leitura de um tribunal pode levar antes de ser interrompida e repetida "
+                             "(padrão: sem limite; não se aplica ao executor sequencial).")
+    parser.add_argument('--tentativas', type=int, default=TENTATIVAS_PADRAO,
+                        help="Execuções de cada tribunal, contando a primeira, antes de ele ser dado como falho "
+                             "e deixado fora das saídas.")
+    parser.add_argument('--tarefas-por-worker', type=int, default=TAREFAS_POR_WORKER_PADRAO,
+                        help="Tarefas que cada processo executa antes de ser substituído, para limitar o crescimento da memória.")
+    parser.add_argument('--streaming', action='store_true',
+                        help="Lê os arquivos em blocos, sem carregar o conjunto inteiro na memória. O 'Consolidado.csv' "
+                             "mantém os números como na origem: '40' não vira '40.0' onde o modo padrão infere float.")
+    parser.add_argument('--tamanho-bloco', type=int, default=TAMANHO_BLOCO_PADRAO,
+                        help="Linhas por bloco no modo streaming.")
+    parser.add_argument('--cache', action='store_true',
+                        help="Reaproveita o cache Parquet dos CSVs que não mudaram desde a última execução.")
+    parser.add_argument('--rebuild-cache', action='store_true',
+                        help="Apaga e reconstrói o cache Parquet (implica --cache).")
+    parser.add_argument('--pasta-cache', default=PASTA_CACHE_PADRAO,
+                        help="Pasta das entradas do cache.")
+    parser.add_argument('--limite-cache-mb', type=int, default=LIMITE_CACHE_PADRAO // 1024 ** 2,
+                        help="Tamanho máximo do cache em MB; as entradas menos usadas são despejadas.")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Relê só os tribunais com arquivos alterados e reaproveita as somas salvas dos demais.")
+    parser.add_argument('--estado', default=ESTADO_PADRAO,
+                        help="Arquivo de estado do modo incremental.")
+    parser.add_argument('--partes-nos-workers', action='store_true',
+                        help="Cada worker grava sua fatia do 'Consolidado.csv'; só as somas voltam pelo executor. Cada fatia "
+                             "usa os tipos inferidos no seu tribunal: um inteiro de uma coluna que é fracionária "
+                             "em outro tribunal sai como '40', e não '40.0' como no modo padrão.")
+    parser.add_argument('--balanceado', action='store_true',
+                        help="Divide os tribunais grandes em subtarefas por arquivo ou faixa de bytes e agenda as maiores primeiro. "
+                             "Como em --partes-nos-workers, os tipos do consolidado são os inferidos em cada subtarefa.")
+    parser.add_argument('--apenas-metas', action='store_true',
+                        help="Calcula só o 'Resumo Metas.CSV', sem consolidado, somando os contadores direto dos arquivos mapeados em memória.")
+    parser.add_argument('--relatorio', default=None,
+                        help="Grava um relatório JSON com duração, linhas, bytes e memória por etapa e por tribunal.")
+    parser.add_argument('--qualidade', default=None,
+                        help="Grava um relatório JSON de qualidade dos dados por tribunal e coluna (células nulas e "
+                             "inválidas, colunas ausentes, ramos misturados, denominadores negativos), contado na própria leitura.")
+    parser.add_argument('--perfil', default=None,
+                        help="Grava um dump do cProfile do processo principal neste arquivo.")
+    parser.add_argument('--formato-saida', default='csv', choices=list(FORMATOS_SAIDA),
+                        help="Formato do consolidado: CSV simples, CSV comprimido ou Parquet particionado por ramo e tribunal.")
+    parser.add_argument('--sem-grafico', action='store_true',
+                        help="Não gera o gráfico nem importa matplotlib. Com --apenas-metas, produz só o resumo.")
+    parser.add_argument('--formato-grafico', default='png', choices=FORMATOS_GRAFICO,
+                        help="PNG com matplotlib (backend Agg) ou SVG/HTML leves, gerados sem matplotlib.")
+    parser.add_argument('--graficos-por-ramo', action='store_true',
+                        help="Além do gráfico geral, gera um gráfico por ramo da justiça, renderizados em paralelo.")
+    parser.add_argument('--apenas-grafico', action='store_true',
+                        help="Só gera os gráficos a partir do 'Resumo Metas.CSV' já salvo, sem recalcular as metas.")
+    parser.add_argument('--vigiar', action='store_true',
+                        help="Fica em execução verificando a pasta Dados/ e regrava o 'Resumo Metas.CSV' "
+                             "quando arquivos mudam, relendo só os tribunais afetados. Usa o arquivo de --estado.")
+    parser.add_argument('--intervalo', type=float, default=INTERVALO_PADRAO,
+                        help="Segundos entre as verificações do modo vigia.")
+    parser.add_argument('--periodo', type=_periodo, default=None,
+                        help="Período ('AAAA' ou 'AAAA-MM') sob o qual numeradores e denominadores das metas "
+                             "são gravados no histórico. Nas consultas, o período consultado (padrão: o mais recente).")
+    parser.add_argument('--historico', default=HISTORICO_PADRAO,
+                        help="Banco SQLite do histórico de metas por período.")
+    parser.add_argument('--consulta-historico', default=None, choices=CONSULTAS_HISTORICO,
+                        help="Consulta o histórico sem ler CSVs: série de um tribunal (--sigla), "
+                             "ranking (opcionalmente por --ramo) ou variação em relação ao período anterior.")
+    parser.add_argument('--sigla', action='append', default=None,
+                        help="Calcula só este tribunal (pode repetir), com os arquivos vindos do índice, "
+                             "e imprime o resumo sem gravar arquivos. Também filtra as consultas ao histórico.")
+    parser.add_argument('--ramo', action='append', default=None,
+                        help="Calcula só os tribunais deste ramo da justiça (pode repetir), como --sigla.")
+    parser.add_argument('--indice', default=INDICE_PADRAO,
+                        help="Índice arquivo -> tribunal/ramo usado por --sigla e --ramo; regravado a cada execução completa.")
+    parser.add_argument('--reindexar', action='store_true',
+                        help="Reconstrói o índice a partir da pasta Dados/ e sai.")
+    parser.add_argument('--meta', default=None, help="Meta da consulta, como 'Meta 1' (padrão: Desempenho Geral).")
+    return parser
+
+
+def main(argv=None, descricao="Calcula as metas dos tribunais.", executor=EXECUTOR_PADRAO):
+    parser = criar_parser(descricao, executor)
+    args = parser.parse_args(argv)
+    perfil = cProfile.Profile() if args.perfil else None
+    if perfil:
+        perfil.enable()
+    if args.consulta_historico:
+        if len(args.sigla or ()) > 1 or len(args.ramo or ()) > 1:
+            parser.error("as consultas ao histórico aceitam uma única --sigla e um único --ramo.")
+        try:
+            imprimir_consulta(args.consulta_historico, sigla=(args.sigla or [None])[0], ramo=(args.ramo or [None])[0],
+                              meta=args.meta, periodo=args.periodo, caminho=args.historico)
+        except ValueError as e:
+            print(f"Erro: {e}")
+    elif args.reindexar:
+        indice = reindexar(caminho=args.indice)
+        print(f"Índice '{args.indice}' reconstruído com {len(indice['tribunais'])} tribunais.")
+    elif args.sigla or args.ramo:
+        calcular(siglas=args.sigla, ramos=args.ramo, executor=args.executor, workers=args.workers,
+                 caminho_indice=args.indice).to_csv(sys.stdout, sep=';', index=False, na_rep='NA')
+    elif args.vigiar:
+        vigiar(executor=args.executor, workers=args.workers, intervalo=args.intervalo, caminho_estado=args.estado,
+               caminho_indice=args.indice, timeout=args.timeout, tentativas=args.tentativas)
+    elif args.apenas_grafico:
+        graficos_do_resumo(executor=args.executor, workers=args.workers,
+                           formato_grafico=args.formato_grafico, graficos_por_ramo=args.graficos_por_ramo)
+    else:
+        executar(executor=args.executor, workers=args.workers,
+                 streaming=args.streaming, tamanho_bloco=args.tamanho_bloco,
+                 usar_cache=args.cache or args.rebuild_cache, rebuild_cache=args.rebuild_cache,
+                 pasta_cache=args.pasta_cache, limite_cache_mb=args.limite_cache_mb,
+                 incremental=args.incremental, caminho_estado=args.estado,
+                 partes_nos_workers=args.partes_nos_workers, balanceado=args.balanceado, apenas_metas=args.apenas_metas,
+                 relatorio=args.relatorio, formato_saida=args.formato_saida, sem_grafico=args.sem_grafico,
+                 formato_grafico=args.formato_grafico, graficos_por_ramo=args.graficos_por_ramo,
+                 periodo=args.periodo, caminho_historico=args.historico, caminho_indice=args.indice,
+                 relatorio_qualidade=args.qualidade, timeout=args.timeout, tentativas=args.tentativas,
+                 tarefas_por_worker=args.tarefas_por_worker)
+    if perfil:
+        perfil.disable()
+        perfil.dump_stats(args.perfil)
@@ -0,0 +1,62 @@
+"""Consulta rápida: metas de um subconjunto de tribunais, sob demanda.
+
+Os arquivos dos tribunais pedidos (por sigla e/ou ramo) vêm do índice de
+metas.indice, sem glob de Dados/ nem leitura de conteúdo, e só eles são
+somados, pela leitura mapeada do modo só metas. Nada é gravado: o resultado
+é o resumo numérico, com as mesmas colunas do 'Resumo Metas.CSV'. Avisos e
+erros vão para stderr, para não se misturarem ao CSV que a linha de comando
+escreve em stdout.
+
+    >>> from metas.consulta import calcular
+    >>> calcular(ramos=['Justiça Federal'])
+    >>> calcular(siglas=['TJSP', 'TJRJ'])
+"""
+import os
+import sys
+
+from metas.executores import criar_executor
+from metas.indice import carregar_indice, reindexar, selecionar
+from metas.padroes import INDICE_PADRAO
+
+
+def _somar(tarefa):
+    """Soma as metas de um tribunal pela leitura mapeada; None se a leitura falhar."""
+    from metas.motor import combinar_somas
+    from metas.mapeada import somar_csv
+
+    sigla_tribunal, lista_arquivos = tarefa
+    try:
+        return combinar_somas([somar_csv(arquivo) for arquivo in lista_arquivos])
+    except Exception as e:
+        print(f"Erro ao ler arquivos para o tribunal {sigla_tribunal}: {e}", file=sys.stderr)
+        return None
+
+
+def _tarefas(siglas, ramos, caminho_indice):
+    indice = carregar_indice(caminho_indice)
+    if indice is None:
+        print(f"Índice '{caminho_indice}' não encontrado; indexando a pasta de dados...", file=sys.stderr)
+        indice = reindexar(caminho=caminho_indice)
+    tarefas, ausentes = selecionar(indice, siglas, ramos)
+    # Índice desatualizado (arquivo removido, sigla nova ou tribunal sem ramo numa consulta por ramo): reconstrói uma vez.
+    sem_ramo = ramos and any(registro['ramo'] is None for registro in indice['tribunais'].values())
+    if ausentes or sem_ramo or not all(os.path.exists(arquivo) for _, arquivos in tarefas for arquivo in arquivos):
+        tarefas, ausentes = selecionar(reindexar(caminho=caminho_indice), siglas, ramos)
+    for sigla in ausentes:
+        print(f"Aviso: Nenhum arquivo encontrado para o tribunal '{sigla}'.", file=sys.stderr)
+    return tarefas
+
+
+def calcular(siglas=None, ramos=None, executor='sequential', workers=None, caminho_indice=INDICE_PADRAO):
+    """Calcula as metas só dos tribunais pedidos e retorna o resumo numérico (DataFrame).
+
+    Metas que não se aplicam ao tribunal ficam NaN. Com mais de um tribunal,
+    as somas são distribuídas pelo executor escolhido.
+    """
+    from metas.motor import combinar_somas
+    from metas.pipeline import calcular_resumo
+
+    tarefas = _tarefas(siglas, ramos, caminho_indice)
+    with criar_executor(executor if len(tarefas) > 1 else 'sequential', workers) as pool:
+        partes = [parte for parte in pool.map(_somar, tarefas) if parte is not None]
+    return calcular_resumo(*combinar_somas(partes))
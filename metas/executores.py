@@ -0,0 +1,220 @@
+"""Executores plugáveis do pipeline: sequencial, pool de processos e pool de threads.
+
+Os três expõem a parte da interface de multiprocessing.Pool usada pelo
+pipeline (map, imap_unordered e uso como gerenciador de contexto). map
+devolve os resultados na ordem das tarefas em todos eles e o pipeline só
+combina resultados nessa ordem, então as saídas não dependem do executor.
+
+O pool de threads evita o fork dos workers e o pickle de tarefas e
+resultados. Ele compensa em entradas pequenas e quando a leitura domina: o
+motor pyarrow lê em threads próprias e o parser C do pandas libera o GIL
+durante a tokenização.
+
+Tolerante envolve qualquer um dos três para o pipeline: cada tarefa vira um
+futuro com prazo e novas tentativas, e uma tarefa que falha de vez não
+derruba os resultados das outras.
+"""
+import multiprocessing
+import os
+import queue
+import signal
+import time
+from collections import deque, namedtuple
+from multiprocessing.pool import ThreadPool
+
+from metas.padroes import TENTATIVAS_PADRAO, TAREFAS_POR_WORKER_PADRAO
+
+EXECUTORES = ('sequential', 'processes', 'threads')
+EXECUTOR_PADRAO = 'processes'
+
+# indice é a posição da tarefa na lista entregue ao executor.
+Falha = namedtuple('Falha', 'indice tribunal motivo tentativas')
+
+
+class Sequencial:
+    """Executa as tarefas no próprio processo, uma por vez."""
+
+    def map(self, funcao, tarefas):
+        return list(map(funcao, tarefas))
+
+    def imap_unordered(self, funcao, tarefas, chunksize=1):
+        return map(funcao, tarefas)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+def _iniciar_worker():
+    # Um processo criado depois que o principal trocou o tratamento de SIGTERM
+    # (modo vigia, reciclagem de workers) volta ao padrão, para que
+    # Pool.terminate() o encerre.
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+
+def criar_executor(nome=EXECUTOR_PADRAO, workers=None, maxtasksperchild=None):
+    """Cria o executor `nome` com `workers` processos ou threads (padrão: número de CPUs).
+
+    Com maxtasksperchild, cada processo é substituído depois de tantas
+    tarefas, o que devolve ao sistema a memória acumulada pelo worker.
+    Threads e o executor sequencial ignoram a opção.
+    """
+    workers = workers or os.cpu_count()
+    if nome == 'sequential':
+        return Sequencial()
+    if nome == 'processes':
+        return multiprocessing.Pool(processes=workers, initializer=_iniciar_worker, maxtasksperchild=maxtasksperchild)
+    if nome == 'threads':
+        return ThreadPool(processes=workers)
+    raise ValueError(f"Executor desconhecido: '{nome}'. Opções: {', '.join(EXECUTORES)}.")
+
+
+def _rotulo(tarefa):
+    """Sigla do tribunal de uma tarefa do pipeline (tupla que começa pela sigla ou Subtarefa)."""
+    sigla = getattr(tarefa, 'sigla', None)
+    if sigla is None and isinstance(tarefa, tuple) and tarefa:
+        sigla = tarefa[0]
+    return str(sigla)
+
+
+def _motivo(erro):
+    return f"{type(erro).__name__}: {erro}"
+
+
+class Tolerante:
+    """Executor do pipeline em que cada tarefa é um futuro (apply_async) com prazo e novas tentativas.
+
+    Uma tarefa que levanta exceção ou passa de `timeout` segundos é
+    resubmetida até somar `tentativas` execuções; depois disso entra em
+    `falhas` (as da última chamada de map ou imap_unordered) e map devolve
+    None no seu lugar, sem perder os resultados das demais. Só `workers`
+    tarefas ficam em voo por vez, então o prazo conta a partir do início
+    real de cada uma.
+
+    Um processo preso só é interrompido derrubando o pool: os workers são
+    recriados e as outras tarefas em voo voltam para a fila sem gastar
+    tentativa. Uma thread não pode ser interrompida: a tarefa que estoura o
+    prazo é abandonada sem nova tentativa (ela ainda poderia gravar a sua
+    parte) e as próximas vão para um pool novo. O executor sequencial repete
+    as tarefas que levantam exceção, mas não aplica o prazo.
+    """
+
+    def __init__(self, nome=EXECUTOR_PADRAO, workers=None, timeout=None, tentativas=TENTATIVAS_PADRAO,
+                 maxtasksperchild=TAREFAS_POR_WORKER_PADRAO):
+        if nome not in EXECUTORES:
+            raise ValueError(f"Executor desconhecido: '{nome}'. Opções: {', '.join(EXECUTORES)}.")
+        self.nome, self.workers = nome, workers or os.cpu_count()
+        self.timeout, self.tentativas, self.maxtasksperchild = timeout, max(1, tentativas), maxtasksperchild
+        self.falhas = []
+        self._pool = None
+        self._abandonados = []
+
+    def _abrir(self):
+        if self._pool is None:
+            self._pool = criar_executor(self.nome, self.workers, self.maxtasksperchild)
+        return self._pool
+
+    def _repetir_ou_falhar(self, pendentes, tarefas, indice, tentativa, motivo, repetir=True):
+        if repetir and tentativa < self.tentativas:
+            print(f"    - Aviso: Tribunal {_rotulo(tarefas[indice])} falhou ({motivo}); "
+                  f"nova tentativa ({tentativa + 1} de {self.tentativas}).")
+            pendentes.append((indice, tentativa + 1))
+        else:
+            self.falhas.append(Falha(indice, _rotulo(tarefas[indice]), motivo, tentativa))
+
+    def _sequencial(self, funcao, tarefas):
+        for indice, tarefa in enumerate(tarefas):
+            pendentes = deque([(indice, 1)])
+            while pendentes:
+                _, tentativa = pendentes.popleft()
+                try:
+                    resultado = funcao(tarefa)
+                except Exception as e:
+                    self._repetir_ou_falhar(pendentes, tarefas, indice, tentativa, _motivo(e))
+                    continue
+                yield indice, resultado
+
+    def _executar(self, funcao, tarefas):
+        """Gera (indice, resultado) das tarefas que completam, na ordem em que completam."""
+        tarefas = list(tarefas)
+        self.falhas = []
+        if self.nome == 'sequential':
+            yield from self._sequencial(funcao, tarefas)
+            return
+        concluidas = queue.Queue()
+        pendentes = deque((indice, 1) for indice in range(len(tarefas)))
+        em_voo = {}  # envio -> (indice, futuro, prazo, tentativa)
+        envios = 0
+        while pendentes or em_voo:
+            while pendentes and len(em_voo) < self.workers:
+                indice, tentativa = pendentes.popleft()
+                envios += 1
+                # O callback só anuncia o envio; resultados de envios descartados são ignorados.
+                avisar = lambda _, envio=envios: concluidas.put(envio)
+                futuro = self._abrir().apply_async(funcao, (tarefas[indice],), callback=avisar, error_callback=avisar)
+                prazo = time.monotonic() + self.timeout if self.timeout else None
+                em_voo[envios] = (indice, futuro, prazo, tentativa)
+
+            prazos = [prazo for _, _, prazo, _ in em_voo.values() if prazo is not None]
+            try:
+                envio = concluidas.get(timeout=max(0, min(prazos) - time.monotonic()) if prazos else None)
+            except queue.Empty:
+                envio = None
+            if envio in em_voo:
+                indice, futuro, _, tentativa = em_voo.pop(envio)
+                try:
+                    resultado = futuro.get()
+                except Exception as e:
+                    self._repetir_ou_falhar(pendentes, tarefas, indice, tentativa, _motivo(e))
+                else:
+                    yield indice, resultado
+
+            agora = time.monotonic()
+            vencidos = [envio for envio, (_, _, prazo, _) in em_voo.items() if prazo is not None and prazo <= agora]
+            if not vencidos:
+                continue
+            motivo = f"tempo esgotado ({self.timeout:g} s)"
+            if self.nome == 'processes':
+                self._pool.terminate()
+                self._pool = None
+                for envio, (indice, _, _, tentativa) in list(em_voo.items()):
+                    if envio not in vencidos:
+                        pendentes.appendleft((indice, tentativa))
+                for envio in vencidos:
+                    indice, _, _, tentativa = em_voo[envio]
+                    self._repetir_ou_falhar(pendentes, tarefas, indice, tentativa, motivo)
+                em_voo.clear()
+            else:
+                # O pool antigo termina o que ainda está em voo; a thread presa fica abandonada.
+                self._pool.close()
+                self._abandonados.append(self._pool)
+                self._pool = None
+                for envio in vencidos:
+                    indice, _, _, tentativa = em_voo.pop(envio)
+                    self._repetir_ou_falhar(pendentes, tarefas, indice, tentativa, motivo, repetir=False)
+
+    def map(self, funcao, tarefas):
+        """Resultados na ordem das tarefas, com None no lugar das que falharam (ver `falhas`)."""
+        tarefas = list(tarefas)
+        resultados = [None] * len(tarefas)
+        for indice, resultado in self._executar(funcao, tarefas):
+            resultados[indice] = resultado
+        return resultados
+
+    def imap_unordered(self, funcao, tarefas, chunksize=1):
+        """Resultados das tarefas que completaram, na ordem em que completam; as falhas ficam em `falhas`."""
+        for _, resultado in self._executar(funcao, tarefas):
+            yield resultado
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        for pool in self._abandonados + [self._pool]:
+            if pool is not None and not isinstance(pool, Sequencial):
+                pool.terminate()
+        self._pool = None
+        self._abandonados = []
+        return False
@@ -0,0 +1,175 @@
+"""Estágio do gráfico, desacoplado do cálculo das metas.
+
+Cada gráfico é um trabalho (destino, título, pares (sigla, desempenho), cor,
+formato). O gráfico geral e os por ramo são disparados assim que o resumo
+fica pronto e renderizados em paralelo pelo executor do pipeline, enquanto o
+processo principal grava o consolidado e o resumo; o Passo 4 só espera o que
+ainda faltar. Os mesmos trabalhos podem ser montados depois, sob demanda, a
+partir do 'Resumo Metas.CSV' salvo.
+
+O PNG usa matplotlib com o backend Agg, sem pyplot. SVG e HTML são escritos
+à mão, sem matplotlib, e saem em milissegundos.
+"""
+import csv
+import html
+import math
+import unicodedata
+
+from metas.executores import criar_executor
+from metas.padroes import FORMATOS_GRAFICO
+
+ARQUIVO_GRAFICO = 'comparativo_desempenho_geral'
+TITULO_GRAFICO = 'Desempenho Geral por Tribunal'
+RAMO_NAO_IDENTIFICADO = 'Ramo não identificado'
+
+
+def _sufixo(ramo):
+    """'Justiça Estadual' -> 'justica_estadual'."""
+    texto = unicodedata.normalize('NFKD', ramo).encode('ascii', 'ignore').decode('ascii')
+    return '_'.join(texto.lower().replace('-', ' ').split())
+
+
+def _ordenar(pares):
+    """Descarta desempenhos nulos, NaN ou não positivos e ordena do menor para o maior."""
+    pares = [(sigla, valor) for sigla, valor in pares if valor is not None and not math.isnan(valor) and valor > 0]
+    return sorted(pares, key=lambda par: par[1])
+
+
+def trabalhos_de_graficos(pares, cor, formato='png', ramos=None):
+    """Monta os trabalhos de renderização: o gráfico geral e, com `ramos` ({sigla: ramo}), um por ramo."""
+    if formato not in FORMATOS_GRAFICO:
+        raise ValueError(f"Formato de gráfico desconhecido: '{formato}'. Opções: {', '.join(FORMATOS_GRAFICO)}.")
+    pares = _ordenar(pares)
+    trabalhos = [(f"{ARQUIVO_GRAFICO}.{formato}", TITULO_GRAFICO, pares, cor, formato)]
+    if ramos:
+        por_ramo = {}
+        for sigla, valor in pares:
+            por_ramo.setdefault(ramos.get(sigla) or RAMO_NAO_IDENTIFICADO, []).append((sigla, valor))
+        for ramo, pares_do_ramo in por_ramo.items():
+            trabalhos.append((f"{ARQUIVO_GRAFICO}_{_sufixo(ramo)}.{formato}",
+                              f"{TITULO_GRAFICO} - {ramo}", pares_do_ramo, cor, formato))
+    return trabalhos
+
+
+def ler_resumo(caminho='Resumo Metas.CSV'):
+    """Lê os pares (sigla, Desempenho Geral) de um resumo salvo, sem pandas."""
+    pares = []
+    with open(caminho, encoding='utf-8-sig', newline='') as f:
+        for linha in csv.DictReader(f, delimiter=';'):
+            valor = linha.get('Desempenho Geral')
+            pares.append((linha['sigla_tribunal'], float(valor) if valor not in (None, '', 'NA') else None))
+    return pares
+
+
+def ler_ramos(tarefas_por_tribunal):
+    """{sigla: ramo_justica} lendo só a primeira linha de dados de um arquivo de cada tribunal."""
+    ramos = {}
+    for sigla, arquivos in tarefas_por_tribunal.items():
+        for arquivo in arquivos:
+            try:
+                with open(arquivo, encoding='utf-8', newline='') as f:
+                    linha = next(csv.DictReader(f), None)
+            except (OSError, UnicodeDecodeError, csv.Error):
+                continue
+            if linha and linha.get('ramo_justica'):
+                ramos[sigla] = linha['ramo_justica']
+                break
+    return ramos
+
+
+# --- RENDERIZAÇÃO ---
+def _renderizar_png(destino, titulo, pares, cor):
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.style
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    matplotlib.style.use('seaborn-v0_8-whitegrid')
+    fig = Figure(figsize=(14, max(8, len(pares) * 0.4)))
+    FigureCanvasAgg(fig)
+    ax = fig.subplots()
+
+    bars = ax.barh([sigla for sigla, _ in pares], [valor for _, valor in pares], color=cor)
+    ax.set_title(titulo, fontsize=18, weight='bold', pad=20)
+    ax.set_xlabel('Índice de Desempenho Geral (Média das Metas)', fontsize=12)
+    ax.set_ylabel('Tribunal', fontsize=12)
+
+    ax.bar_label(bars, fmt='%.2f', padding=5, fontsize=10, color='dimgray')
+
+    if pares:
+        ax.set_xlim(right=pares[-1][1] * 1.18)
+
+    ax.tick_params(axis='x', labelsize=10)
+    ax.tick_params(axis='y', labelsize=10)
+    ax.grid(axis='x', linestyle='--', alpha=0.7)
+    fig.tight_layout()
+    fig.savefig(destino, dpi=150)
+
+
+def _svg(titulo, pares, cor):
+    largura, margem_esquerda, margem_direita, altura_barra = 900, 110, 70, 22
+    topo = 60
+    altura = topo + altura_barra * max(len(pares), 1) + 50
+    maximo = pares[-1][1] if pares else 1
+    escala = (largura - margem_esquerda - margem_direita) / maximo
+    partes = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{largura}" height="{altura}" '
+        f'font-family="sans-serif" font-size="12">',
+        f'<rect width="{largura}" height="{altura}" fill="white"/>',
+        f'<text x="{largura / 2:.0f}" y="32" text-anchor="middle" font-size="18" font-weight="bold">'
+        f'{html.escape(titulo)}</text>',
+    ]
+    # O maior desempenho fica no topo, como no PNG.
+    for i, (sigla, valor) in enumerate(reversed(pares)):
+        y = topo + i * altura_barra
+        comprimento = valor * escala
+        partes.append(f'<text x="{margem_esquerda - 8}" y="{y + 15}" text-anchor="end">{html.escape(sigla)}</text>')
+        partes.append(f'<rect x="{margem_esquerda}" y="{y + 3}" width="{comprimento:.1f}" '
+                      f'height="{altura_barra - 6}" fill="{cor}"/>')
+        partes.append(f'<text x="{margem_esquerda + comprimento + 5:.1f}" y="{y + 15}" fill="dimgray">{valor:.2f}</text>')
+    partes.append(f'<text x="{largura / 2:.0f}" y="{altura - 15}" text-anchor="middle">'
+                  'Índice de Desempenho Geral (Média das Metas)</text>')
+    partes.append('</svg>')
+    return '\n'.join(partes)
+
+
+def renderizar(trabalho):
+    """Renderiza um trabalho de gráfico e retorna o caminho gravado."""
+    destino, titulo, pares, cor, formato = trabalho
+    if formato == 'png':
+        _renderizar_png(destino, titulo, pares, cor)
+        return destino
+    conteudo = _svg(titulo, pares, cor)
+    if formato == 'html':
+        conteudo = (f'<!DOCTYPE html>\n<html lang="pt-BR">\n<head><meta charset="utf-8">'
+                    f'<title>{html.escape(titulo)}</title></head>\n<body>\n{conteudo}\n</body>\n</html>')
+    with open(destino, 'w', encoding='utf-8') as f:
+        f.write(conteudo + '\n')
+    return destino
+
+
+# --- ESTÁGIO EM SEGUNDO PLANO ---
+def iniciar_graficos(trabalhos, executor='processes', workers=None):
+    """Dispara a renderização sem bloquear e retorna o estágio a entregar para aguardar_graficos().
+
+    Só o PNG vai para um pool: com o executor de processos, matplotlib é
+    importado apenas nos workers do gráfico. SVG e HTML custam milissegundos e,
+    como o PNG do executor sequencial, são renderizados no próprio Passo 4.
+    """
+    if executor == 'sequential' or not trabalhos or trabalhos[0][4] != 'png':
+        return None, trabalhos
+    pool = criar_executor(executor, min(workers or len(trabalhos), len(trabalhos)))
+    return pool, pool.map_async(renderizar, trabalhos)
+
+
+def aguardar_graficos(estagio):
+    """Espera os gráficos disparados por iniciar_graficos() e retorna os arquivos gravados."""
+    pool, pendente = estagio
+    if pool is None:
+        return [renderizar(trabalho) for trabalho in pendente]
+    try:
+        return pendente.get()
+    finally:
+        pool.close()
+        pool.join()
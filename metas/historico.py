@@ -0,0 +1,173 @@
+"""Histórico de metas por período, num banco SQLite local.
+
+Cada execução com --periodo grava, para cada tribunal e meta, o numerador,
+o denominador e o multiplicador que deram o resultado, com chave
+(periodo, sigla_tribunal, meta). As consultas (série de um tribunal,
+ranking por ramo e variação entre períodos) saem só dessas linhas, com
+índices do SQLite, sem reler CSV nenhum.
+
+A meta de cada linha vale numerador / denominador * multiplicador (0 com
+denominador zero) e o Desempenho Geral de um tribunal é a média das suas
+metas no período, como no 'Resumo Metas.CSV'. Períodos são textos
+'AAAA' ou 'AAAA-MM' e se ordenam como texto.
+"""
+import re
+import sqlite3
+
+from metas.padroes import HISTORICO_PADRAO
+
+DESEMPENHO_GERAL = 'Desempenho Geral'
+FORMATO_PERIODO = re.compile(r'\d{4}(-(0[1-9]|1[0-2]))?')
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS metas (
+    periodo TEXT NOT NULL,
+    sigla_tribunal TEXT NOT NULL,
+    ramo_justica TEXT,
+    meta TEXT NOT NULL,
+    numerador REAL NOT NULL,
+    denominador REAL NOT NULL,
+    multiplicador REAL NOT NULL,
+    PRIMARY KEY (periodo, sigla_tribunal, meta)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS metas_por_tribunal ON metas (sigla_tribunal, meta, periodo);
+CREATE INDEX IF NOT EXISTS metas_por_ramo ON metas (ramo_justica, periodo);
+"""
+
+_VALOR = "CASE WHEN denominador != 0 THEN numerador / denominador * multiplicador ELSE 0 END"
+
+
+def validar_periodo(periodo):
+    """Retorna o período se estiver no formato 'AAAA' ou 'AAAA-MM'; senão levanta ValueError."""
+    if not FORMATO_PERIODO.fullmatch(periodo):
+        raise ValueError(f"Período inválido: '{periodo}'. Use 'AAAA' ou 'AAAA-MM'.")
+    return periodo
+
+
+def _conectar(caminho):
+    conexao = sqlite3.connect(caminho)
+    conexao.executescript(_ESQUEMA)
+    return conexao
+
+
+def gravar_periodo(componentes, periodo, caminho=HISTORICO_PADRAO):
+    """Substitui o período no histórico pelas tuplas de motor.componentes_metas(); retorna quantas linhas gravou."""
+    validar_periodo(periodo)
+    conexao = _conectar(caminho)
+    try:
+        with conexao:
+            conexao.execute("DELETE FROM metas WHERE periodo = ?", (periodo,))
+            conexao.executemany(
+                "INSERT INTO metas VALUES (?, ?, ?, ?, ?, ?, ?)",
+                ((periodo, str(sigla), ramo, meta, num, den, mult)
+                 for sigla, ramo, meta, num, den, mult in componentes))
+    finally:
+        conexao.close()
+    return len(componentes)
+
+
+def _filtro_meta(meta):
+    """Trecho SQL e parâmetros para uma meta ou, sem meta, para a média de todas (Desempenho Geral)."""
+    if meta in (None, DESEMPENHO_GERAL):
+        return "", ()
+    return " AND meta = ?", (meta,)
+
+
+def periodos(caminho=HISTORICO_PADRAO):
+    """Períodos gravados, do mais antigo ao mais recente."""
+    conexao = _conectar(caminho)
+    try:
+        return [p for p, in conexao.execute("SELECT DISTINCT periodo FROM metas ORDER BY periodo")]
+    finally:
+        conexao.close()
+
+
+def serie(sigla, meta=None, caminho=HISTORICO_PADRAO):
+    """[(periodo, valor)] da meta (ou do Desempenho Geral) de um tribunal, em ordem de período."""
+    filtro, parametros = _filtro_meta(meta)
+    conexao = _conectar(caminho)
+    try:
+        return conexao.execute(
+            f"SELECT periodo, AVG({_VALOR}) FROM metas WHERE sigla_tribunal = ?{filtro} "
+            "GROUP BY periodo ORDER BY periodo", (sigla, *parametros)).fetchall()
+    finally:
+        conexao.close()
+
+
+def _valores_do_periodo(conexao, periodo, meta, ramo):
+    filtro, parametros = _filtro_meta(meta)
+    if ramo is not None:
+        filtro += " AND ramo_justica = ?"
+        parametros += (ramo,)
+    return conexao.execute(
+        f"SELECT sigla_tribunal, ramo_justica, AVG({_VALOR}) FROM metas WHERE periodo = ?{filtro} "
+        "GROUP BY sigla_tribunal", (periodo, *parametros)).fetchall()
+
+
+def ranking(periodo=None, ramo=None, meta=None, caminho=HISTORICO_PADRAO):
+    """[(sigla, ramo, valor)] do maior para o menor no período (padrão: o mais recente), opcionalmente de um ramo."""
+    conexao = _conectar(caminho)
+    try:
+        if periodo is None:
+            periodo, = conexao.execute("SELECT MAX(periodo) FROM metas").fetchone()
+            if periodo is None:
+                return []
+        linhas = _valores_do_periodo(conexao, periodo, meta, ramo)
+    finally:
+        conexao.close()
+    return sorted(linhas, key=lambda linha: (-linha[2], linha[0]))
+
+
+def variacao(periodo=None, ramo=None, meta=None, caminho=HISTORICO_PADRAO):
+    """Compara o período (padrão: o mais recente) com o anterior gravado.
+
+    Retorna (anterior, [(sigla, valor anterior, valor atual, diferença)]),
+    com None nos valores de tribunais presentes em só um dos períodos.
+    """
+    conexao = _conectar(caminho)
+    try:
+        if periodo is None:
+            periodo, = conexao.execute("SELECT MAX(periodo) FROM metas").fetchone()
+        anterior, = conexao.execute("SELECT MAX(periodo) FROM metas WHERE periodo < ?", (periodo,)).fetchone()
+        if periodo is None or anterior is None:
+            return anterior, []
+        atuais = {sigla: valor for sigla, _, valor in _valores_do_periodo(conexao, periodo, meta, ramo)}
+        antigos = {sigla: valor for sigla, _, valor in _valores_do_periodo(conexao, anterior, meta, ramo)}
+    finally:
+        conexao.close()
+    linhas = []
+    for sigla in sorted(atuais.keys() | antigos.keys()):
+        antes, agora = antigos.get(sigla), atuais.get(sigla)
+        linhas.append((sigla, antes, agora, agora - antes if antes is not None and agora is not None else None))
+    return anterior, linhas
+
+
+def _formatar(valor):
+    return 'NA' if valor is None else f"{valor:.2f}"
+
+
+def imprimir_consulta(consulta, sigla=None, ramo=None, meta=None, periodo=None, caminho=HISTORICO_PADRAO):
+    """Executa e imprime uma das consultas: 'serie', 'ranking' ou 'variacao'."""
+    nome_meta = meta or DESEMPENHO_GERAL
+    if consulta == 'serie':
+        if sigla is None:
+            raise ValueError("A consulta 'serie' exige --sigla.")
+        print(f"{nome_meta} de {sigla} por período:")
+        for p, valor in serie(sigla, meta, caminho):
+            print(f"  {p:<8} {_formatar(valor):>10}")
+    elif consulta == 'ranking':
+        linhas = ranking(periodo, ramo, meta, caminho)
+        print(f"Ranking de {nome_meta}" + (f" - {ramo}" if ramo else "") + (f" em {periodo}" if periodo else "") + ":")
+        for posicao, (s, r, valor) in enumerate(linhas, 1):
+            print(f"  {posicao:>3}. {s:<10} {_formatar(valor):>10}  {r}")
+    elif consulta == 'variacao':
+        anterior, linhas = variacao(periodo, ramo, meta, caminho)
+        if anterior is None:
+            print("Aviso: Não há período anterior gravado para comparar.")
+            return
+        print(f"Variação de {nome_meta} em relação a {anterior}:")
+        for s, antes, agora, diferenca in linhas:
+            sinal = '' if diferenca is None else ('+' if diferenca >= 0 else '')
+            print(f"  {s:<10} {_formatar(antes):>10} -> {_formatar(agora):>10}  ({sinal}{_formatar(diferenca)})")
+    else:
+        raise ValueError(f"Consulta desconhecida: '{consulta}'.")
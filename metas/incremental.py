@@ -0,0 +1,106 @@
+"""Recalculo incremental: só os tribunais com arquivos alterados são relidos.
+
+O estado persistido guarda, para cada tribunal do mapa de arquivos, a
+impressão digital (tamanho e mtime) dos seus CSVs e as somas por coluna
+calculadas na última leitura. As metas de todos os tribunais saem dessas
+somas, sem tocar nos CSVs que não mudaram.
+"""
+import json
+import os
+
+import pandas as pd
+
+from metas.instrumentacao import etapa
+from metas.motor import COLUNAS_METAS, combinar_somas, somar_por_tribunal
+from metas.ingestao import ler_csv
+from metas.padroes import ESTADO_PADRAO
+
+VERSAO_ESTADO = 1
+
+
+def impressao_digital(arquivos):
+    """Mapeia cada arquivo para [tamanho, mtime_ns]."""
+    digital = {}
+    for arquivo in arquivos:
+        info = os.stat(arquivo)
+        digital[os.path.realpath(arquivo)] = [info.st_size, info.st_mtime_ns]
+    return digital
+
+
+def carregar_estado(caminho=ESTADO_PADRAO):
+    """Lê o estado salvo; retorna um estado vazio se não existir ou for de outra versão da tabela de metas."""
+    vazio = {'versao': VERSAO_ESTADO, 'colunas': COLUNAS_METAS, 'tribunais': {}}
+    try:
+        with open(caminho, encoding='utf-8') as f:
+            estado = json.load(f)
+    except (OSError, ValueError):
+        return vazio
+    if estado.get('versao') != VERSAO_ESTADO or estado.get('colunas') != COLUNAS_METAS:
+        return vazio
+    return estado
+
+
+def salvar_estado(estado, caminho=ESTADO_PADRAO):
+    """Grava o estado de forma atômica."""
+    temporario = f"{caminho}.tmp"
+    with open(temporario, 'w', encoding='utf-8') as f:
+        json.dump(estado, f, ensure_ascii=False)
+    os.replace(temporario, caminho)
+
+
+def tarefas_alteradas(tarefas_por_tribunal, estado):
+    """Retorna as tarefas (sigla, arquivos) cujos arquivos mudaram e descarta do estado os tribunais que sumiram."""
+    tribunais = estado['tribunais']
+    for sigla in list(tribunais):
+        if sigla not in tarefas_por_tribunal:
+            del tribunais[sigla]
+    alteradas = []
+    for sigla, arquivos in tarefas_por_tribunal.items():
+        registro = tribunais.get(sigla)
+        if registro is None or registro['arquivos'] != impressao_digital(arquivos):
+            alteradas.append((sigla, arquivos))
+    return alteradas
+
+
+def somar_tarefa(tarefa, ler=ler_csv):
+    """Lê só as colunas das metas dos arquivos de um tribunal e retorna (sigla, (somas, ramos)).
+
+    Erros de leitura sobem para o executor (metas.executores.Tolerante).
+    """
+    sigla_tribunal, lista_arquivos = tarefa
+    print(f"  - Processando: {sigla_tribunal} (Lendo {len(lista_arquivos)} arquivo(s))")
+    with etapa('leitura', sigla_tribunal, lista_arquivos) as medida:
+        dfs = [ler(arquivo, apenas_metas=True) for arquivo in lista_arquivos]
+        medida['linhas'] = sum(len(df) for df in dfs)
+    partes = [somar_por_tribunal(df) for df in dfs]
+    return sigla_tribunal, combinar_somas(partes)
+
+
+def registrar(estado, sigla, arquivos, resultado, digital=None):
+    """Guarda no estado as somas recalculadas de um tribunal (ou o remove, se a leitura falhou).
+
+    `digital` é a impressão digital tomada antes da leitura; sem ela, os
+    arquivos são consultados de novo.
+    """
+    if resultado is None:
+        estado['tribunais'].pop(sigla, None)
+        return
+    somas, ramos = resultado
+    estado['tribunais'][sigla] = {
+        'arquivos': digital if digital is not None else impressao_digital(arquivos),
+        'somas': {str(s): linha for s, linha in somas.to_dict(orient='index').items()},
+        'ramos': {str(s): r for s, r in ramos.items()},
+    }
+
+
+def somas_do_estado(estado, tarefas_por_tribunal):
+    """Junta as somas guardadas de todos os tribunais, na ordem do mapa de arquivos."""
+    partes = []
+    for sigla in tarefas_por_tribunal:
+        registro = estado['tribunais'].get(sigla)
+        if registro is None or not registro['somas']:
+            continue
+        somas = pd.DataFrame.from_dict(registro['somas'], orient='index').reindex(columns=COLUNAS_METAS, fill_value=0)
+        ramos = pd.Series(registro['ramos'], dtype=object).reindex(somas.index)
+        partes.append((somas, ramos))
+    return combinar_somas(partes)
@@ -0,0 +1,99 @@
+"""Índice arquivo -> tribunal/ramo, para consultas sem varrer Dados/.
+
+O índice guarda, para cada tribunal, o ramo_justica e a lista dos seus
+CSVs. Toda execução completa do pipeline (e cada atualização do modo vigia)
+o regrava com o mapa de arquivos e os ramos que já conhece, então uma
+consulta por sigla ou ramo sabe quais arquivos abrir sem glob e sem ler
+conteúdo. --reindexar o reconstrói com um glob e a primeira linha de um
+arquivo por tribunal.
+"""
+import json
+import os
+
+from metas.padroes import PASTA_DADOS, INDICE_PADRAO
+
+VERSAO_INDICE = 1
+
+
+def montar_indice(tarefas_por_tribunal, ramos):
+    """Monta o índice a partir do mapa {sigla: [arquivos]} e de {sigla: ramo}."""
+    return {
+        'versao': VERSAO_INDICE,
+        'tribunais': {str(sigla): {'ramo': ramos.get(sigla), 'arquivos': list(arquivos)}
+                      for sigla, arquivos in tarefas_por_tribunal.items()},
+    }
+
+
+def salvar_indice(indice, caminho=INDICE_PADRAO):
+    """Grava o índice de forma atômica."""
+    temporario = f"{caminho}.{os.getpid()}.tmp"
+    with open(temporario, 'w', encoding='utf-8') as f:
+        json.dump(indice, f, ensure_ascii=False)
+    os.replace(temporario, caminho)
+
+
+def atualizar_indice(tarefas_por_tribunal, ramos, caminho=INDICE_PADRAO):
+    """Regrava o índice com o mapa de arquivos e os ramos {sigla: ramo} de uma execução.
+
+    Um tribunal sem ramo na execução (leitura que falhou ou tribunal
+    ignorado) mantém o ramo do índice anterior ou, sem ele, o da primeira
+    linha de um dos seus arquivos regulares; assim uma consulta por ramo não
+    o perde.
+    """
+    from metas.grafico import ler_ramos
+
+    ramos = {sigla: ramo for sigla, ramo in ramos.items() if isinstance(ramo, str) and ramo}
+    anterior = carregar_indice(caminho) or {'tribunais': {}}
+    for sigla in tarefas_por_tribunal:
+        registro = anterior['tribunais'].get(sigla)
+        if sigla not in ramos and registro and registro['ramo']:
+            ramos[sigla] = registro['ramo']
+    # Só arquivos regulares: um FIFO travado não pode prender o processo principal aqui.
+    faltando = {sigla: [arquivo for arquivo in arquivos if os.path.isfile(arquivo)]
+                for sigla, arquivos in tarefas_por_tribunal.items() if sigla not in ramos}
+    ramos.update(ler_ramos(faltando))
+    indice = montar_indice(tarefas_por_tribunal, ramos)
+    salvar_indice(indice, caminho)
+    return indice
+
+
+def carregar_indice(caminho=INDICE_PADRAO):
+    """Lê o índice salvo; retorna None se não existir ou for de outra versão."""
+    try:
+        with open(caminho, encoding='utf-8') as f:
+            indice = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return indice if indice.get('versao') == VERSAO_INDICE else None
+
+
+def reindexar(pasta=PASTA_DADOS, caminho=INDICE_PADRAO):
+    """Reconstrói o índice com um glob da pasta e a primeira linha de um arquivo por tribunal."""
+    from metas.pipeline import mapear_arquivos
+    from metas.grafico import ler_ramos
+
+    tarefas_por_tribunal = mapear_arquivos(pasta)
+    indice = montar_indice(tarefas_por_tribunal, ler_ramos(tarefas_por_tribunal))
+    salvar_indice(indice, caminho)
+    return indice
+
+
+def selecionar(indice, siglas=None, ramos=None):
+    """Tarefas (sigla, arquivos) dos tribunais pedidos, na ordem do índice.
+
+    Siglas e ramos são comparados sem diferenciar maiúsculas; sem nenhum dos
+    dois, todos os tribunais são selecionados. Retorna (tarefas, siglas
+    pedidas que não estão no índice).
+    """
+    siglas = {s.casefold(): s for s in siglas or ()}
+    ramos = {r.casefold() for r in ramos or ()}
+    tarefas = []
+    encontradas = set()
+    for sigla, registro in indice['tribunais'].items():
+        pela_sigla = sigla.casefold() in siglas
+        pelo_ramo = (registro['ramo'] or '').casefold() in ramos
+        if pela_sigla or pelo_ramo or not (siglas or ramos):
+            tarefas.append((sigla, registro['arquivos']))
+        if pela_sigla:
+            encontradas.add(sigla.casefold())
+    return tarefas, [original for chave, original in siglas.items() if chave not in encontradas]
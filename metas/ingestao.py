@@ -0,0 +1,121 @@
+"""Leitura padronizada dos CSVs de Dados/.
+
+Todas as leituras passam por aqui, com o parser C (ou pyarrow, quando
+instalado) e um esquema declarado: sigla_tribunal e ramo_justica como
+category e os contadores das metas em inteiros compactos. Células numéricas
+inválidas continuam virando 0, como no safe_sum original.
+"""
+import numpy as np
+import pandas as pd
+
+from metas import qualidade
+from metas.motor import COLUNAS_METAS
+
+try:
+    import pyarrow  # noqa: F401
+    MOTOR_CSV = 'pyarrow'
+except ImportError:
+    MOTOR_CSV = 'c'
+
+COLUNAS_CATEGORICAS = ['sigla_tribunal', 'ramo_justica']
+PREFIXOS_CONTADORES = ('julgm', 'distm', 'suspm')
+
+# --- ESQUEMA DECLARADO ---
+# Contadores por meta cabem em int32; os totais anuais (*_2025) ficam em int64.
+ESQUEMA = {coluna: 'category' for coluna in COLUNAS_CATEGORICAS}
+ESQUEMA.update({
+    coluna: 'int32' if coluna.startswith(PREFIXOS_CONTADORES) else 'int64'
+    for coluna in COLUNAS_METAS
+})
+
+# Colunas lidas quando só as metas interessam (sem Consolidado.csv).
+COLUNAS_LEITURA_METAS = frozenset(['sigla_tribunal', 'ramo_justica', *COLUNAS_METAS])
+
+_TIPOS_CATEGORICOS = {coluna: 'category' for coluna in COLUNAS_CATEGORICAS}
+
+
+def ler_cabecalho(arquivo):
+    """Retorna a lista de colunas de um CSV (caminho ou buffer) sem ler as linhas de dados."""
+    colunas = list(pd.read_csv(arquivo, sep=',', encoding='utf-8', nrows=0).columns)
+    if hasattr(arquivo, 'seek'):
+        arquivo.seek(0)
+    return colunas
+
+
+def aplicar_esquema(df):
+    """Converte os contadores presentes para os tipos do ESQUEMA; inválidos e vazios viram 0.
+
+    Se a coluna tiver valores fracionários ou fora da faixa do tipo compacto,
+    ela fica em float64 para não perder informação. Com a qualidade ativa, as
+    células nulas e inválidas de cada tribunal são contadas na conversão.
+    """
+    contar = qualidade.ativa() and 'sigla_tribunal' in df.columns
+    originais, convertidos = {}, {}
+    for coluna in df.columns:
+        tipo = ESQUEMA.get(coluna)
+        if tipo is None or tipo == 'category':
+            continue
+        valores = df[coluna]
+        if not pd.api.types.is_numeric_dtype(valores):
+            valores = pd.to_numeric(valores, errors='coerce')
+        if contar:
+            originais[coluna], convertidos[coluna] = df[coluna], valores
+        valores = valores.fillna(0)
+        limites = np.iinfo(tipo)
+        na_faixa = valores.between(limites.min, limites.max).all()
+        if pd.api.types.is_integer_dtype(valores):
+            # Inteiros fora da faixa do tipo compacto ficam em 64 bits, sem dar a volta.
+            if not na_faixa:
+                tipo = np.int64 if valores.dtype.kind == 'i' else np.float64
+        elif not (na_faixa and (valores % 1 == 0).all()):
+            tipo = np.float64
+        df[coluna] = valores.astype(tipo)
+    if originais:
+        qualidade.contar_celulas(df['sigla_tribunal'], originais, convertidos)
+    return df
+
+
+def ler_csv(arquivo, apenas_metas=False, motor=None):
+    """Lê um CSV de Dados/ com o esquema declarado.
+
+    Com apenas_metas, só as colunas das metas são lidas e os contadores saem
+    já convertidos. Sem ele, o arquivo é lido inteiro para o consolidado e as
+    colunas numéricas ficam com o tipo inferido pelo parser.
+    """
+    motor = motor or MOTOR_CSV
+    opcoes = {'sep': ',', 'encoding': 'utf-8', 'engine': motor}
+    if motor == 'pyarrow':
+        # O engine pyarrow do pandas converte o frame inteiro ao receber dtype,
+        # o que falha em colunas inteiras com vazios; as categorias vêm depois.
+        if apenas_metas:
+            opcoes['usecols'] = [coluna for coluna in ler_cabecalho(arquivo) if coluna in COLUNAS_LEITURA_METAS]
+    else:
+        opcoes['dtype'] = _TIPOS_CATEGORICOS
+        if apenas_metas:
+            opcoes['usecols'] = lambda coluna: coluna in COLUNAS_LEITURA_METAS
+        else:
+            opcoes['low_memory'] = False
+    df = pd.read_csv(arquivo, **opcoes)
+    if motor == 'pyarrow':
+        for coluna in COLUNAS_CATEGORICAS:
+            if coluna in df.columns:
+                df[coluna] = df[coluna].astype('category')
+    return aplicar_esquema(df) if apenas_metas else df
+
+
+def ler_csv_em_blocos(arquivo, tamanho_bloco, apenas_metas=False):
+    """Itera sobre o CSV em DataFrames de até tamanho_bloco linhas (sempre com o parser C).
+
+    Com apenas_metas, cada bloco traz só as colunas das metas já no esquema.
+    Caso contrário todas as colunas são lidas como texto, para que o
+    consolidado não dependa dos tipos inferidos em cada bloco; as células
+    vazias ou com marcadores de nulo ('NA', 'NaN'...) saem vazias, como na
+    leitura inteira. Os números saem como estão na origem: onde a leitura
+    inteira infere float, '40' não vira '40.0'.
+    """
+    if apenas_metas:
+        leitor = pd.read_csv(arquivo, sep=',', encoding='utf-8', engine='c', chunksize=tamanho_bloco,
+                             usecols=lambda coluna: coluna in COLUNAS_LEITURA_METAS, dtype=_TIPOS_CATEGORICOS)
+        return (aplicar_esquema(bloco) for bloco in leitor)
+    return pd.read_csv(arquivo, sep=',', encoding='utf-8', engine='c', chunksize=tamanho_bloco,
+                       dtype=str)
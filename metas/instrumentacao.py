@@ -0,0 +1,101 @@
+"""Instrumentação leve das etapas do pipeline.
+
+Cada etapa medida com `etapa(...)` registra duração, linhas processadas,
+bytes lidos e o pico de memória do processo. Os registros só são gravados
+quando a instrumentação está ativa: ativar() liga o canal de
+metas.registros anunciado pela variável de ambiente METAS_INSTRUMENTACAO,
+herdada pelos workers do multiprocessing, e gerar_relatorio() junta os
+registros de todos os processos num relatório JSON.
+"""
+import json
+import os
+import resource
+import sys
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+from metas.registros import Canal
+
+VARIAVEL_AMBIENTE = 'METAS_INSTRUMENTACAO'
+_CANAL = Canal(VARIAVEL_AMBIENTE, 'instrumentacao_metas_')
+
+
+def ativar():
+    """Liga a instrumentação para este processo e seus workers; retorna a pasta dos registros."""
+    return _CANAL.ativar()
+
+
+def desativar():
+    """Desliga a instrumentação e apaga os registros brutos."""
+    _CANAL.desativar()
+
+
+def pico_memoria_mb():
+    """Pico de RSS do processo atual em MB."""
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico / (1024 ** 2 if sys.platform == 'darwin' else 1024)
+
+
+@contextmanager
+def etapa(nome, tribunal=None, arquivos=None):
+    """Mede o bloco como a etapa `nome`.
+
+    Entrega um dicionário em que o chamador pode preencher 'linhas' e
+    'bytes_lidos'; se arquivos for informado, bytes_lidos começa com o
+    tamanho somado deles. Sem instrumentação ativa nada é medido.
+    """
+    registro = {'etapa': nome, 'tribunal': tribunal, 'linhas': None, 'bytes_lidos': None}
+    if not _CANAL.ativo():
+        yield registro
+        return
+    if arquivos:
+        registro['bytes_lidos'] = sum(os.path.getsize(arquivo) for arquivo in arquivos)
+    inicio = time.perf_counter()
+    try:
+        yield registro
+    finally:
+        registro['duracao_s'] = time.perf_counter() - inicio
+        registro['pico_memoria_mb'] = round(pico_memoria_mb(), 1)
+        registro['pid'] = os.getpid()
+        _CANAL.anexar([registro])
+
+
+def _acumular(destino, registro):
+    destino['chamadas'] += 1
+    destino['duracao_s'] += registro['duracao_s']
+    destino['linhas'] += registro['linhas'] or 0
+    destino['bytes_lidos'] += registro['bytes_lidos'] or 0
+    destino['pico_memoria_mb'] = max(destino['pico_memoria_mb'], registro['pico_memoria_mb'])
+
+
+def _novo_acumulador():
+    return {'chamadas': 0, 'duracao_s': 0.0, 'linhas': 0, 'bytes_lidos': 0, 'pico_memoria_mb': 0.0}
+
+
+def gerar_relatorio(destino, duracao_total_s, parametros=None):
+    """Agrega os registros de todos os processos em destino (JSON) e desliga a instrumentação.
+
+    O relatório traz os totais por etapa, os totais por tribunal e etapa e
+    os registros brutos.
+    """
+    registros = _CANAL.ler()
+    por_etapa = defaultdict(_novo_acumulador)
+    por_tribunal = defaultdict(lambda: defaultdict(_novo_acumulador))
+    for registro in registros:
+        _acumular(por_etapa[registro['etapa']], registro)
+        if registro['tribunal'] is not None:
+            _acumular(por_tribunal[registro['tribunal']][registro['etapa']], registro)
+    relatorio = {
+        'duracao_total_s': round(duracao_total_s, 4),
+        'pico_memoria_principal_mb': round(pico_memoria_mb(), 1),
+        'processos': len({registro['pid'] for registro in registros}),
+        'parametros': parametros or {},
+        'etapas': por_etapa,
+        'tribunais': por_tribunal,
+        'registros': registros,
+    }
+    with open(destino, 'w', encoding='utf-8') as f:
+        json.dump(relatorio, f, ensure_ascii=False, indent=2)
+    desativar()
+    return relatorio
@@ -0,0 +1,359 @@
+"""Leitura mapeada em memória para a execução só de metas.
+
+Quando o consolidado não é gerado, só as colunas das metas interessam e
+nenhum DataFrame precisa ser montado: o CSV é aberto com mmap, visto como um
+array de bytes sem cópia e tokenizado com NumPy em blocos de linhas. Para
+cada bloco as posições dos separadores dão o início e o fim de cada campo
+e os contadores são convertidos direto para uma matriz inteira e somados
+por tribunal em int64. O caminho rápido cobre campos só com dígitos ou sem
+nenhum dígito; sinais e aspas passam pelo caminho completo, campo a campo.
+
+As regras de coerção são as de coagir_colunas: vazios e textos sem dígito
+viram 0. Células que o tokenizador não sabe converter exatamente (decimais,
+notação científica, espaços) ou linhas com número de campos diferente do
+cabeçalho fazem o arquivo inteiro voltar para a leitura com o pandas, então
+as somas são sempre as mesmas do caminho normal. Como no agendador, supõe-se
+que nenhum campo entre aspas contém quebra de linha.
+"""
+import csv
+import mmap
+import os
+import traceback
+
+import numpy as np
+import pandas as pd
+
+from metas import qualidade
+from metas.motor import COLUNAS_METAS, somar_por_tribunal
+from metas.ingestao import ler_csv
+
+BYTES_POR_BLOCO = 4 * 1024 ** 2
+# Acima disso um inteiro pode não caber em int64; a célula vai para o pandas.
+MAXIMO_DIGITOS = 18
+
+_ASPAS, _VIRGULA, _QUEBRA, _RETORNO = ord('"'), ord(','), ord('\n'), ord('\r')
+
+
+def _cabecalho(dados):
+    fim = dados.find(b'\n')
+    fim = len(dados) if fim < 0 else fim + 1
+    linha = dados[:fim].decode('utf-8')
+    if linha.startswith('\ufeff'):
+        linha = linha[1:]
+    return next(csv.reader([linha])), fim
+
+
+def _campos(buf, por_linha, primeira, ultima):
+    """Início e fim (exclusivo) das colunas primeira..ultima-1 em cada linha.
+
+    Retorna duas matrizes linhas x colunas, já sem aspas externas nem '\\r' final.
+    """
+    fim = por_linha[:, primeira:ultima].copy()
+    inicio = np.empty_like(fim)
+    if primeira == 0:
+        inicio[0, 0] = 0
+        inicio[1:, 0] = por_linha[:-1, -1] + 1
+        inicio[:, 1:] = por_linha[:, :ultima - 1] + 1
+    else:
+        inicio[:] = por_linha[:, primeira - 1:ultima - 1] + 1
+    fim -= (fim > inicio) & (buf[fim - 1] == _RETORNO)
+    aspas = (fim - inicio >= 2) & (buf[np.minimum(inicio, len(buf) - 1)] == _ASPAS) & (buf[fim - 1] == _ASPAS)
+    return inicio + aspas, fim - aspas
+
+
+def _bytes_dos_campos(buf, inicio, fim):
+    """Matriz linhas x maior campo com os bytes de um campo por linha, completada com zeros."""
+    largura = int((fim - inicio).max(initial=0))
+    posicoes = np.arange(largura)
+    validos = posicoes < (fim - inicio)[:, None]
+    indices = np.where(validos, inicio[:, None] + posicoes, 0)
+    return np.where(validos, buf[indices], 0).astype(np.uint8), validos
+
+
+def _contadores_simples(buf, por_linha, primeira, ultima):
+    """Caminho rápido: converte as colunas primeira..ultima-1 sem sinais, aspas nem decimais.
+
+    Cada campo é lido do fim para o início. Campos só com dígitos são
+    inteiros e campos sem nenhum dígito ('', 'NA', 'x') valem 0, como em
+    coagir_colunas. Retorna None se algum campo misturar dígitos com outros
+    caracteres, for largo demais para int64 ou puder ser 'inf' e precisar
+    do caminho completo.
+    """
+    fim = por_linha[:, primeira:ultima]
+    if primeira == 0:
+        anteriores = np.empty_like(fim)
+        anteriores[0, 0] = -1
+        anteriores[1:, 0] = por_linha[:-1, -1]
+        anteriores[:, 1:] = por_linha[:, :ultima - 1]
+    else:
+        anteriores = por_linha[:, primeira - 1:ultima - 1]
+    if ultima == por_linha.shape[1]:
+        retornos = buf[fim[:, -1] - 1] == _RETORNO
+        if retornos.any():
+            fim = fim.copy()
+            fim[:, -1] -= retornos & (fim[:, -1] - 1 > anteriores[:, -1])
+    largura = fim - anteriores - 1
+    maior = int(largura.max(initial=0))
+    # Antes do laço: 10 ** posicao já estouraria o int64 com 19 dígitos ou mais.
+    if maior > MAXIMO_DIGITOS:
+        return None
+    # Os valores por campo usam o menor tipo que comporta o campo mais largo;
+    # as somas são feitas em int64.
+    tipo = np.uint8 if maior <= 2 else np.uint16 if maior <= 4 else np.uint32 if maior <= 9 else np.int64
+    valores = np.zeros(largura.shape, dtype=tipo)
+    num_digitos = np.zeros(largura.shape, dtype=np.uint8 if maior < 256 else np.int64)
+    for posicao in range(maior):
+        digito = buf[fim - (posicao + 1)] - np.uint8(ord('0'))
+        eh_digito = (digito < 10) & (largura > posicao)
+        num_digitos += eh_digito
+        digito *= eh_digito
+        valores += digito if posicao == 0 else digito * tipo(10 ** posicao)
+    com_outro = num_digitos < largura
+    if not com_outro.any():
+        return valores
+    if (com_outro & (num_digitos > 0)).any():
+        return None
+    # 'inf' e 'infinity', com aspas e sinal opcionais, viram infinito no pandas, não 0.
+    ultimo = len(buf) - 1
+    inicio = anteriores + 1
+    for prefixos in ([_ASPAS], [ord('-'), ord('+')]):
+        inicio = inicio + (np.isin(buf[np.minimum(inicio, ultimo)], prefixos) & (inicio < fim))
+    if (com_outro & (inicio < fim) & ((buf[np.minimum(inicio, ultimo)] | 0x20) == ord('i'))).any():
+        return None
+    valores[com_outro] = 0
+    return valores
+
+
+def _converter_contadores(buf, inicio, fim):
+    """Caminho completo: converte os campos (linhas x colunas) para int64.
+
+    Aceita sinal, vazios e textos sem dígito (que valem 0). Retorna None se
+    alguma célula exigir o pandas. Os campos andam juntos, uma posição de
+    byte por vez: como os contadores têm poucos dígitos, são poucas passadas.
+    """
+    largura = fim - inicio
+    valores = np.zeros(largura.shape, dtype=np.int64)
+    ultimo = len(buf) - 1
+    invalidos = np.zeros(largura.shape, dtype=bool)
+    com_digito = np.zeros(largura.shape, dtype=bool)
+    infinitos = np.zeros(largura.shape, dtype=bool)
+    sinal = negativos = np.zeros(largura.shape, dtype=bool)
+    for posicao in range(int(largura.max(initial=0))):
+        dentro = largura > posicao
+        byte = buf[np.minimum(inicio + posicao, ultimo)]
+        digito = byte - np.uint8(ord('0'))
+        eh_digito = dentro & (digito < 10)
+        corpo = dentro
+        if posicao == 0:
+            sinal = dentro & ((byte == ord('-')) | (byte == ord('+')))
+            negativos = sinal & (byte == ord('-'))
+            corpo = dentro & ~sinal
+        # 'inf' e 'infinity' viram infinito no pandas, não 0.
+        if posicao < 2:
+            primeiro = corpo if posicao == 0 else sinal & dentro
+            infinitos |= primeiro & ((byte | 0x20) == ord('i'))
+        invalidos |= corpo & ~eh_digito
+        com_digito |= eh_digito
+        np.multiply(valores, 10, out=valores, where=eh_digito)
+        np.add(valores, digito, out=valores, where=eh_digito)
+    num_digitos = largura - sinal
+    inteiros = ~invalidos & (num_digitos > 0)
+    if not (inteiros | (~com_digito & ~infinitos)).all() or (num_digitos * inteiros).max(initial=0) > MAXIMO_DIGITOS:
+        return None
+    valores[~inteiros] = 0
+    np.negative(valores, out=valores, where=negativos)
+    return valores
+
+
+def _texto(bytes_campo):
+    texto = bytes_campo.decode('utf-8')
+    return texto.replace('""', '"') if '"' in texto else texto
+
+
+def _contar_bloco(buf, por_linha, indices, grupo_da_linha, nomes, validas, contagens):
+    """Acumula em contagens ({sigla: registro}) os contadores de qualidade de um bloco já somado.
+
+    Campos vazios ou com marcadores nulos contam como nulas e campos sem
+    dígito como inválidas; campos com dígito já foram convertidos pelo bloco.
+    """
+    grupos = grupo_da_linha[validas]
+    linhas = np.bincount(grupos, minlength=len(nomes))
+    registros = {g: contagens.setdefault(nomes[g], qualidade.novo_registro())
+                 for g in np.flatnonzero(linhas) if nomes[g]}
+    for g, registro in registros.items():
+        registro['linhas'] += int(linhas[g])
+        for coluna in COLUNAS_METAS:
+            if coluna not in indices:
+                registro['ausentes'][coluna] += int(linhas[g])
+
+    presentes = [coluna for coluna in COLUNAS_METAS if coluna in indices]
+    if presentes:
+        posicoes = np.array([indices[coluna] for coluna in presentes])
+        primeira = posicoes.min()
+        inicio, fim = _campos(buf, por_linha, primeira, posicoes.max() + 1)
+        inicio, fim = inicio[validas][:, posicoes - primeira], fim[validas][:, posicoes - primeira]
+        largura = fim - inicio
+        com_digito = np.zeros(largura.shape, dtype=bool)
+        for posicao in range(int(largura.max(initial=0))):
+            digito = buf[np.minimum(inicio + posicao, len(buf) - 1)] - np.uint8(ord('0'))
+            com_digito |= (largura > posicao) & (digito < 10)
+        nulas = largura == 0
+        invalidas = ~com_digito & ~nulas
+        # Marcadores como 'NA' são nulos no pandas; só os campos de texto são decodificados.
+        for linha, j in zip(*np.nonzero(invalidas)):
+            if _texto(bytes(buf[inicio[linha, j]:fim[linha, j]])) in qualidade.MARCADORES_NULOS:
+                invalidas[linha, j], nulas[linha, j] = False, True
+        for nome, mascara in (('nulas', nulas), ('invalidas', invalidas)):
+            for j in np.flatnonzero(mascara.any(axis=0)):
+                por_grupo = np.bincount(grupos[mascara[:, j]], minlength=len(nomes))
+                for g in np.flatnonzero(por_grupo):
+                    if g in registros:
+                        registros[g][nome][presentes[j]] += int(por_grupo[g])
+
+    coluna_ramo = indices.get('ramo_justica')
+    if coluna_ramo is not None:
+        inicio, fim = _campos(buf, por_linha, coluna_ramo, coluna_ramo + 1)
+        textos, _ = _bytes_dos_campos(buf, inicio[validas, 0], fim[validas, 0])
+        if textos.shape[1]:
+            chaves = np.ascontiguousarray(textos).view(f'S{textos.shape[1]}').ravel()
+            unicos, inverso = np.unique(chaves, return_inverse=True)
+            pares, quantidades = np.unique(grupos * len(unicos) + inverso, return_counts=True)
+            for par, quantidade in zip(pares.tolist(), quantidades.tolist()):
+                g, r = divmod(par, len(unicos))
+                ramo = _texto(bytes(unicos[r]))
+                if ramo and g in registros:
+                    registros[g]['ramos'][ramo] += quantidade
+
+
+def _somar_bloco(buf, num_colunas, indices, acumulado, contagens=None):
+    """Soma um bloco de linhas completas em acumulado; retorna False se o bloco exigir o pandas.
+
+    Com contagens, acumula também os contadores de qualidade do bloco.
+    """
+    quebras = buf == _QUEBRA
+    virgulas = buf == _VIRGULA
+    aspas = buf == _ASPAS
+    if aspas.any():
+        # Vírgulas dentro de aspas não separam campos.
+        virgulas &= np.bitwise_xor.accumulate(aspas.view(np.uint8)) == 0
+    separadores = np.flatnonzero(virgulas | quebras)
+    if buf[-1] != _QUEBRA:
+        separadores = np.append(separadores, len(buf))
+    # Cada linha precisa ter exatamente os campos do cabeçalho.
+    if len(separadores) % num_colunas:
+        return False
+    # Se as quebras são exatamente os últimos separadores de cada linha,
+    # nenhuma linha tem campos a mais ou a menos.
+    por_linha = separadores.reshape(-1, num_colunas)
+    finais = por_linha[:, -1]
+    finais = finais[finais < len(buf)]
+    if np.count_nonzero(quebras) != len(finais) or not quebras[finais].all():
+        return False
+
+    linhas = len(por_linha)
+    presentes = [j for j, coluna in enumerate(COLUNAS_METAS) if coluna in indices]
+    somas = np.zeros((1, len(COLUNAS_METAS)), dtype=np.int64)
+    valores = np.zeros((linhas, 0), dtype=np.int64)
+    if presentes:
+        # Contadores são convertidos na faixa de colunas que os contém; as
+        # colunas de texto no meio dela não são usadas.
+        posicoes = np.array([indices[COLUNAS_METAS[j]] for j in presentes])
+        primeira, ultima = posicoes.min(), posicoes.max() + 1
+        seletor = posicoes - primeira
+        valores = _contadores_simples(buf, por_linha, primeira, ultima)
+        if valores is None:
+            inicio, fim = _campos(buf, por_linha, primeira, ultima)
+            valores = _converter_contadores(buf, inicio[:, seletor], fim[:, seletor])
+            if valores is None:
+                return False
+        elif len(seletor) != ultima - primeira or (seletor != np.arange(len(seletor))).any():
+            valores = valores[:, seletor]
+
+    coluna_sigla = indices['sigla_tribunal']
+    inicio, fim = _campos(buf, por_linha, coluna_sigla, coluna_sigla + 1)
+    siglas, validos = _bytes_dos_campos(buf, inicio[:, 0], fim[:, 0])
+    vazias = ~validos.any(axis=1) if siglas.shape[1] else np.ones(linhas, dtype=bool)
+    if (siglas == siglas[0]).all():
+        grupos, primeiras = siglas[:1], np.array([0])
+        inverso = np.zeros(linhas, dtype=np.intp)
+        somas[0, presentes] = (valores[~vazias] if vazias.any() else valores).sum(axis=0, dtype=np.int64)
+    else:
+        chaves = np.ascontiguousarray(siglas).view(f'S{siglas.shape[1]}').ravel()
+        _, primeiras, inverso = np.unique(chaves, return_index=True, return_inverse=True)
+        grupos = siglas[primeiras]
+        somas = np.zeros((len(primeiras), len(COLUNAS_METAS)), dtype=np.int64)
+        parciais = np.zeros((len(primeiras), valores.shape[1]), dtype=np.int64)
+        np.add.at(parciais, inverso[~vazias], valores[~vazias])
+        somas[:, presentes] = parciais
+
+    coluna_ramo = indices.get('ramo_justica')
+    campos_ramo = None
+    for g in np.argsort(primeiras, kind='stable'):
+        linha = primeiras[g]
+        if vazias[linha]:
+            continue
+        sigla = _texto(bytes(grupos[g]).rstrip(b'\0'))
+        if sigla not in acumulado:
+            ramo = np.nan
+            if coluna_ramo is not None:
+                # Sobre o bloco inteiro: com o ramo na coluna 0, o início do campo vem do fim da linha anterior.
+                if campos_ramo is None:
+                    campos_ramo = _campos(buf, por_linha, coluna_ramo, coluna_ramo + 1)
+                inicio, fim = campos_ramo[0][linha, 0], campos_ramo[1][linha, 0]
+                if fim > inicio:
+                    ramo = _texto(bytes(buf[inicio:fim]))
+            acumulado[sigla] = [np.zeros(len(COLUNAS_METAS), dtype=np.int64), ramo]
+        acumulado[sigla][0] += somas[g]
+
+    if contagens is not None:
+        nomes = [_texto(bytes(grupo).rstrip(b'\0')) for grupo in grupos]
+        _contar_bloco(buf, por_linha, indices, inverso, nomes, ~vazias, contagens)
+    return True
+
+
+def somar_mapeado(arquivo, bytes_por_bloco=BYTES_POR_BLOCO):
+    """Soma as colunas das metas de um CSV sem montar DataFrame.
+
+    Retorna (somas, ramos) como somar_por_tribunal, ou None se o arquivo tiver
+    células ou linhas que só a leitura com o pandas converte corretamente.
+    """
+    if os.path.getsize(arquivo) == 0:
+        return None
+    with open(arquivo, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as dados:
+        colunas, inicio = _cabecalho(dados)
+        indices = {coluna: i for i, coluna in reversed(list(enumerate(colunas)))}
+        if 'sigla_tribunal' not in indices:
+            return None
+        buf = np.frombuffer(dados, dtype=np.uint8)
+        acumulado = {}
+        # Os contadores de qualidade só valem se o arquivo inteiro for lido aqui.
+        contagens = {} if qualidade.ativa() else None
+        try:
+            while inicio < len(buf):
+                fim = dados.find(b'\n', min(inicio + bytes_por_bloco, len(buf)) - 1)
+                fim = len(buf) if fim < 0 else fim + 1
+                if not _somar_bloco(buf[inicio:fim], len(colunas), indices, acumulado, contagens):
+                    return None
+                inicio = fim
+        except BaseException as e:
+            # Os quadros do traceback guardam views do buffer; sem limpá-los o
+            # mmap não fecha e um BufferError esconderia o erro original.
+            traceback.clear_frames(e.__traceback__)
+            raise
+        finally:
+            # O mmap só fecha quando nenhuma view do buffer continua viva.
+            del buf
+    qualidade.registrar(contagens)
+    somas = pd.DataFrame([valores for valores, _ in acumulado.values()], index=list(acumulado),
+                         columns=COLUNAS_METAS, dtype=np.int64)
+    somas.index.name = 'sigla_tribunal'
+    ramos = pd.Series([ramo for _, ramo in acumulado.values()], index=somas.index, dtype=object, name='ramo_justica')
+    return somas, ramos
+
+
+def somar_csv(arquivo):
+    """somar_mapeado com volta para ler_csv + somar_por_tribunal quando necessário."""
+    resultado = somar_mapeado(arquivo)
+    if resultado is None:
+        resultado = somar_por_tribunal(ler_csv(arquivo, apenas_metas=True))
+    return resultado
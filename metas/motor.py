@@ -0,0 +1,260 @@
+"""Motor vetorizado de cálculo das metas.
+
+As fórmulas de cada ramo ficam declaradas em TABELA_METAS. As colunas usadas
+são convertidas para número uma única vez, somadas por tribunal com um único
+groupby e as metas de todos os tribunais saem de aritmética de arrays NumPy.
+"""
+import numpy as np
+import pandas as pd
+
+from metas import qualidade
+
+# --- TABELA DECLARATIVA DE METAS ---
+# Cada entrada é (nome da meta, coluna do numerador, colunas do denominador, multiplicador).
+# Denominador com três colunas: d0 + d1 - d2. Com duas colunas: d0 - d1.
+DENOMINADOR_META_1 = ['casos_novos_2025', 'dessobrestados_2025', 'suspensos_2025']
+
+TABELA_METAS = {
+    'Justiça Estadual': [
+        ('Meta 1', 'julgados_2025', DENOMINADOR_META_1, 100),
+        ('Meta 2A', 'julgm2_a', ['distm2_a', 'suspm2_a'], 1000 / 8),
+        ('Meta 2B', 'julgm2_b', ['distm2_b', 'suspm2_b'], 1000 / 9),
+        ('Meta 2C', 'julgm2_c', ['distm2_c', 'suspm2_c'], 1000 / 9.5),
+        ('Meta 2ANT', 'julgm2_ant', ['distm2_ant', 'suspm2_ant'], 100),
+        ('Meta 4A', 'julgm4_a', ['distm4_a', 'suspm4_a'], 1000 / 6.5),
+        ('Meta 4B', 'julgm4_b', ['distm4_b', 'suspm4_b'], 100),
+        ('Meta 6', 'julgm6_a', ['distm6_a', 'suspm6_a'], 100),
+        ('Meta 7A', 'julgm7_a', ['distm7_a', 'suspm7_a'], 1000 / 5),
+        ('Meta 7B', 'julgm7_b', ['distm7_b', 'suspm7_b'], 1000 / 5),
+        ('Meta 8A', 'julgm8_a', ['distm8_a', 'suspm8_a'], 1000 / 7.5),
+        ('Meta 8B', 'julgm8_b', ['distm8_b', 'suspm8_b'], 1000 / 9),
+        ('Meta 10A', 'julgm10_a', ['distm10_a', 'suspm10_a'], 1000 / 9),
+        ('Meta 10B', 'julgm10_b', ['distm10_b', 'suspm10_b'], 1000 / 10),
+    ],
+    'Justiça Eleitoral': [
+        ('Meta 1', 'julgados_2025', DENOMINADOR_META_1, 100),
+        ('Meta 2A', 'julgm2_a', ['distm2_a', 'suspm2_a'], 1000 / 7.0),
+        ('Meta 2B', 'julgm2_b', ['distm2_b', 'suspm2_b'], 1000 / 9.9),
+        ('Meta 2ANT', 'julgm2_ant', ['distm2_ant', 'suspm2_ant'], 100),
+        ('Meta 4A', 'julgm4_a', ['distm4_a', 'suspm4_a'], 1000 / 9),
+        ('Meta 4B', 'julgm4_b', ['distm4_b', 'suspm4_b'], 1000 / 5),
+    ],
+    'Justiça do Trabalho': [
+        ('Meta 1', 'julgados_2025', DENOMINADOR_META_1, 100),
+        ('Meta 2A', 'julgm2_a', ['distm2_a', 'suspm2_a'], 1000 / 9.4),
+        ('Meta 2ANT', 'julgm2_ant', ['distm2_ant', 'suspm2_ant'], 100),
+    ],
+    'Justiça Federal': [
+        ('Meta 1', 'julgados_2025', DENOMINADOR_META_1, 100),
+        ('Meta 2A', 'julgm2_a', ['distm2_a', 'suspm2_a'], 1000 / 8.5),
+        ('Meta 2B', 'julgm2_b', ['distm2_b', 'suspm2_b'], 100),
+        ('Meta 2ANT', 'julgm2_ant', ['distm2_ant', 'suspm2_ant'], 100),
+        ('Meta 4A', 'julgm4_a', ['distm4_a', 'suspm4_a'], 1000 / 7),
+        ('Meta 4B', 'julgm4_b', ['distm4_b', 'suspm4_b'], 100),
+        ('Meta 6', 'julgm6_a', ['distm6_a', 'suspm6_a'], 1000 / 3.5),
+        ('Meta 7A', 'julgm7_a', ['distm7_a', 'suspm7_a'], 1000 / 3.5),
+        ('Meta 7B', 'julgm7_b', ['distm7_b', 'suspm7_b'], 1000 / 3.5),
+        ('Meta 8A', 'julgm8_a', ['distm8_a', 'suspm8_a'], 1000 / 7.5),
+        ('Meta 8B', 'julgm8_b', ['distm8_b', 'suspm8_b'], 1000 / 9),
+        ('Meta 10A', 'julgm10_a', ['distm10_a', 'suspm10_a'], 100),
+    ],
+    'Justiça Militar da União': [
+        ('Meta 1', 'julgados_2025', DENOMINADOR_META_1, 100),
+        ('Meta 2A', 'julgm2_a', ['distm2_a', 'suspm2_a'], 1000 / 9.5),
+        ('Meta 2B', 'julgm2_b', ['distm2_b', 'suspm2_b'], 1000 / 9.9),
+        ('Meta 2ANT', 'julgm2_ant', ['distm2_ant', 'suspm2_ant'], 100),
+        ('Meta 4A', 'julgm4_a', ['distm4_a', 'suspm4_a'], 1000 / 9.5),
+        ('Meta 4B', 'julgm4_b', ['distm4_b', 'suspm4_b'], 1000 / 9.9),
+    ],
+    'Justiça Militar Estadual': [
+        ('Meta 1', 'julgados_2025', DENOMINADOR_META_1, 100),
+        ('Meta 2A', 'julgm2_a', ['distm2_a', 'suspm2_a'], 1000 / 9),
+        ('Meta 2B', 'julgm2_b', ['distm2_b', 'suspm2_b'], 1000 / 9.5),
+        ('Meta 2ANT', 'julgm2_ant', ['distm2_ant', 'suspm2_ant'], 100),
+        ('Meta 4A', 'julgm4_a', ['distm4_a', 'suspm4_a'], 1000 / 9.5),
+        ('Meta 4B', 'julgm4_b', ['distm4_b', 'suspm4_b'], 1000 / 9.9),
+    ],
+    'Superior Tribunal de Justiça': [
+        ('Meta 1', 'julgados_2025', DENOMINADOR_META_1, 100),
+        ('Meta 2ANT', 'julgm2_ant', ['distm2_ant', 'suspm2_ant'], 100),
+        ('Meta 4A', 'julgm4_a', ['distm4_a', 'suspm4_a'], 1000 / 9),
+        ('Meta 4B', 'julgm4_b', ['distm4_b', 'suspm4_b'], 100),
+        ('Meta 6', 'julgm6_a', ['distm6_a', 'suspm6_a'], 1000 / 7.5),
+        ('Meta 7A', 'julgm7_a', ['distm7_a', 'suspm7_a'], 1000 / 7.5),
+        ('Meta 7B', 'julgm7_b', ['distm7_b', 'suspm7_b'], 1000 / 7.5),
+        ('Meta 8', 'julgm8_a', ['distm8_a', 'suspm8_a'], 1000 / 10),
+        ('Meta 10', 'julgm10_a', ['distm10_a', 'suspm10_a'], 1000 / 10),
+    ],
+    'Tribunal Superior do Trabalho': [
+        ('Meta 1', 'julgados_2025', DENOMINADOR_META_1, 100),
+        ('Meta 2A', 'julgm2_a', ['distm2_a', 'suspm2_a'], 1000 / 9.5),
+        ('Meta 2B', 'julgm2_b', ['distm2_b', 'suspm2_b'], 1000 / 9.9),
+        ('Meta 2ANT', 'julgm2_ant', ['distm2_ant', 'suspm2_ant'], 100),
+    ],
+}
+
+# Tribunais Superiores compartilham o ramo; a fórmula é escolhida pela sigla.
+TRIBUNAIS_SUPERIORES = {
+    'STJ': 'Superior Tribunal de Justiça',
+    'TST': 'Tribunal Superior do Trabalho',
+}
+
+# Todas as colunas lidas por alguma fórmula, na ordem em que aparecem na tabela.
+COLUNAS_METAS = list(dict.fromkeys(
+    coluna
+    for formulas in TABELA_METAS.values()
+    for _, num_col, den_cols, _ in formulas
+    for coluna in [num_col, *den_cols]
+))
+_INDICE_COLUNA = {coluna: i for i, coluna in enumerate(COLUNAS_METAS)}
+# Posição extra, sempre zero, usada como segunda parcela dos denominadores de duas colunas.
+_COLUNA_ZERO = len(COLUNAS_METAS)
+
+
+def _compilar(formulas):
+    """Transforma as fórmulas de um ramo em vetores de índices para indexação NumPy."""
+    nomes, num, d0, d1, d2, mult = [], [], [], [], [], []
+    for nome, num_col, den_cols, multiplicador in formulas:
+        nomes.append(nome)
+        num.append(_INDICE_COLUNA[num_col])
+        if len(den_cols) == 3:
+            d0.append(_INDICE_COLUNA[den_cols[0]])
+            d1.append(_INDICE_COLUNA[den_cols[1]])
+            d2.append(_INDICE_COLUNA[den_cols[2]])
+        else:
+            d0.append(_INDICE_COLUNA[den_cols[0]])
+            d1.append(_COLUNA_ZERO)
+            d2.append(_INDICE_COLUNA[den_cols[1]])
+        mult.append(multiplicador)
+    return nomes, np.array(num), np.array(d0), np.array(d1), np.array(d2), np.array(mult, dtype=np.float64)
+
+_FORMULAS_COMPILADAS = {ramo: _compilar(formulas) for ramo, formulas in TABELA_METAS.items()}
+
+
+def resolver_ramo(ramo, sigla):
+    """Retorna a chave de TABELA_METAS usada pelo tribunal, ou None se não houver fórmula."""
+    if ramo == 'Tribunais Superiores':
+        return TRIBUNAIS_SUPERIORES.get(sigla)
+    return ramo if ramo in TABELA_METAS else None
+
+
+def coagir_colunas(df):
+    """Converte uma única vez as colunas das metas para número; ausentes ou inválidas viram 0.
+
+    Com a qualidade ativa (metas.qualidade), conta na mesma passada as
+    células nulas e inválidas, as linhas por ramo e as colunas ausentes.
+    """
+    contar = qualidade.ativa()
+    dados, originais, convertidos, ausentes = {}, {}, {}, []
+    for coluna in COLUNAS_METAS:
+        if coluna in df.columns:
+            valores = pd.to_numeric(df[coluna], errors='coerce')
+            if contar:
+                originais[coluna], convertidos[coluna] = df[coluna], valores
+            dados[coluna] = valores.fillna(0)
+        else:
+            ausentes.append(coluna)
+            dados[coluna] = np.zeros(len(df), dtype=np.int64)
+    if contar:
+        qualidade.contar_celulas(df['sigla_tribunal'], originais, convertidos)
+        qualidade.contar_linhas(df, ausentes)
+    return pd.DataFrame(dados, index=df.index)
+
+
+def somar_por_tribunal(df):
+    """Soma as colunas das metas por tribunal com um único groupby.
+
+    Retorna (somas, ramos): um DataFrame indexado por sigla_tribunal com uma
+    coluna por entrada de COLUNAS_METAS e uma Series com o ramo_justica da
+    primeira linha de cada tribunal. A ordem é a de primeira aparição.
+    """
+    numericos = coagir_colunas(df)
+    numericos['sigla_tribunal'] = df['sigla_tribunal'].to_numpy()
+    somas = numericos.groupby('sigla_tribunal', sort=False).sum()
+    ramos = df.drop_duplicates('sigla_tribunal').set_index('sigla_tribunal')['ramo_justica']
+    return somas, ramos.reindex(somas.index)
+
+
+def combinar_somas(partes):
+    """Agrega somas parciais (lista de pares (somas, ramos)) de um mesmo conjunto de tribunais."""
+    partes = [(somas, ramos) for somas, ramos in partes if not somas.empty]
+    if not partes:
+        return pd.DataFrame(columns=COLUNAS_METAS, dtype=np.float64), pd.Series(dtype=object)
+    somas = pd.concat([somas for somas, _ in partes]).groupby(level=0, sort=False).sum()
+    ramos = pd.concat([ramos for _, ramos in partes])
+    ramos = ramos[~ramos.index.duplicated()]
+    return somas, ramos.reindex(somas.index)
+
+
+def _avaliar_formulas(somas, ramos):
+    """Gera, para cada fórmula com tribunais, (linhas, nomes, numerador, denominador, multiplicador).
+
+    linhas indexa somas.index; numerador e denominador são matrizes
+    (tribunais da fórmula x metas da fórmula).
+    """
+    siglas = somas.index.to_numpy()
+    chaves = np.array([resolver_ramo(ramo, sigla) for sigla, ramo in zip(siglas, ramos.to_numpy())], dtype=object)
+    matriz = np.zeros((len(siglas), _COLUNA_ZERO + 1), dtype=np.float64)
+    matriz[:, :_COLUNA_ZERO] = somas.reindex(columns=COLUNAS_METAS, fill_value=0).to_numpy(dtype=np.float64)
+
+    for chave, (nomes, num, d0, d1, d2, mult) in _FORMULAS_COMPILADAS.items():
+        linhas = np.flatnonzero(chaves == chave)
+        if len(linhas) == 0:
+            continue
+        bloco = matriz[linhas]
+        yield linhas, nomes, bloco[:, num], bloco[:, d0] + bloco[:, d1] - bloco[:, d2], mult
+
+
+def calcular_metas(somas, ramos):
+    """Calcula as metas de todos os tribunais a partir das somas por tribunal.
+
+    Retorna uma lista de dicionários no mesmo formato produzido antes pelas
+    funções calcular_metas_*, na ordem de somas.index. Tribunais sem fórmula
+    para o ramo ficam de fora.
+    """
+    siglas = somas.index.to_numpy()
+    resultados = [None] * len(siglas)
+    for linhas, nomes, numerador, denominador, mult in _avaliar_formulas(somas, ramos):
+        desempenho = np.divide(numerador, denominador, out=np.zeros_like(numerador), where=denominador != 0)
+        valores = desempenho * mult
+        for linha, vetor in zip(linhas, valores.tolist()):
+            resultado = {'sigla_tribunal': siglas[linha]}
+            resultado.update(zip(nomes, vetor))
+            resultados[linha] = resultado
+    return [resultado for resultado in resultados if resultado is not None]
+
+
+def matriz_metas(somas, ramos, nomes):
+    """Resultados das metas numa matriz float64 pré-alocada (tribunais x nomes).
+
+    As metas que não se aplicam ao ramo do tribunal, e as colunas de nomes
+    que nenhuma fórmula produz, ficam NaN. Retorna (siglas, matriz) só com
+    os tribunais que têm fórmula, na ordem de somas.index.
+    """
+    posicao = {nome: i for i, nome in enumerate(nomes)}
+    matriz = np.full((len(somas.index), len(nomes)), np.nan)
+    calculados = np.zeros(len(somas.index), dtype=bool)
+    for linhas, nomes_formula, numerador, denominador, mult in _avaliar_formulas(somas, ramos):
+        origem = [i for i, nome in enumerate(nomes_formula) if nome in posicao]
+        destino = [posicao[nomes_formula[i]] for i in origem]
+        desempenho = np.divide(numerador, denominador, out=np.zeros_like(numerador), where=denominador != 0)
+        matriz[np.ix_(linhas, destino)] = (desempenho * mult)[:, origem]
+        calculados[linhas] = True
+    return somas.index.to_numpy()[calculados], matriz[calculados]
+
+
+def componentes_metas(somas, ramos):
+    """Numerador, denominador e multiplicador de cada meta de cada tribunal.
+
+    Retorna tuplas (sigla, ramo_justica, meta, numerador, denominador,
+    multiplicador) na ordem de somas.index; a meta vale
+    numerador / denominador * multiplicador (0 com denominador zero).
+    """
+    siglas = somas.index.to_numpy()
+    ramos_por_linha = ramos.to_numpy()
+    componentes = [None] * len(siglas)
+    for linhas, nomes, numerador, denominador, mult in _avaliar_formulas(somas, ramos):
+        for linha, nums, dens in zip(linhas, numerador.tolist(), denominador.tolist()):
+            componentes[linha] = [(siglas[linha], ramos_por_linha[linha], nome, n, d, m)
+                                  for nome, n, d, m in zip(nomes, nums, dens, mult.tolist())]
+    return [tupla for tuplas in componentes if tuplas is not None for tupla in tuplas]
@@ -0,0 +1,31 @@
+"""Valores padrão das opções do pipeline.
+
+Ficam num módulo sem dependências para que a linha de comando e o
+orquestrador possam montar as opções sem importar pandas, numpy ou
+matplotlib. Os módulos que usam cada valor o reexportam com o mesmo nome.
+"""
+PASTA_DADOS = 'Dados/'
+
+TAMANHO_BLOCO_PADRAO = 100_000
+
+PASTA_CACHE_PADRAO = '.cache_metas'
+LIMITE_CACHE_PADRAO = 2 * 1024 ** 3
+
+ESTADO_PADRAO = '.estado_metas.json'
+
+HISTORICO_PADRAO = 'historico_metas.sqlite'
+
+INDICE_PADRAO = '.indice_metas.json'
+
+# Execuções por tarefa (a primeira e as novas tentativas) e tarefas por processo antes de reciclá-lo.
+TENTATIVAS_PADRAO = 2
+TAREFAS_POR_WORKER_PADRAO = 20
+
+FORMATOS_SAIDA = {
+    'csv': 'Consolidado.csv',
+    'csv.gz': 'Consolidado.csv.gz',
+    'csv.zst': 'Consolidado.csv.zst',
+    'parquet': 'Consolidado.parquet',
+}
+
+FORMATOS_GRAFICO = ('png', 'svg', 'html')
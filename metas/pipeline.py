@@ -0,0 +1,334 @@
+"""Pipeline completo do cálculo de metas, comum a todos os executores.
+
+O trabalho é dividido em uma tarefa por tribunal (ou em subtarefas, no modo
+balanceado) e entregue ao executor escolhido em metas.executores. Leitura,
+motor de metas e escrita das saídas são os mesmos para todos; os resultados
+são sempre combinados na ordem das tarefas, então 'Resumo Metas.CSV' e o
+consolidado saem idênticos byte a byte com qualquer executor.
+"""
+import glob
+import os
+import tempfile
+import time
+from collections import defaultdict
+from functools import partial
+
+# Só módulos sem pandas no topo: a linha de comando, a validação da pasta de
+# dados e os workers não pagam a importação de pandas nem de matplotlib. Os
+# módulos pesados são importados dentro de executar(), depois da validação,
+# e matplotlib só nos workers do estágio do gráfico (metas.grafico).
+from metas.instrumentacao import etapa, ativar, gerar_relatorio
+from metas.qualidade import ativar as ativar_qualidade, gerar_relatorio_qualidade
+from metas.padroes import (PASTA_DADOS, TAMANHO_BLOCO_PADRAO, PASTA_CACHE_PADRAO,
+                           LIMITE_CACHE_PADRAO, ESTADO_PADRAO, HISTORICO_PADRAO, INDICE_PADRAO,
+                           TENTATIVAS_PADRAO, TAREFAS_POR_WORKER_PADRAO)
+from metas.executores import EXECUTOR_PADRAO, Tolerante
+from metas.grafico import trabalhos_de_graficos, iniciar_graficos, aguardar_graficos, ler_resumo, ler_ramos
+
+# executor -> (descrição do Passo 2, nome da execução na mensagem final, cor do gráfico)
+APRESENTACAO = {
+    'sequential': ('em modo sequencial', 'NÃO-PARALELA', 'darkcyan'),
+    'processes': ('em paralelo', 'OTIMIZADA PARALELA', 'rebeccapurple'),
+    'threads': ('em paralelo com threads', 'PARALELA COM THREADS', 'teal'),
+}
+
+COLUNAS_RESUMO = [
+    'sigla_tribunal', 'Meta 1', 'Meta 2A', 'Meta 2B', 'Meta 2C', 'Meta 2ANT',
+    'Meta 4A', 'Meta 4B', 'Meta 6', 'Meta 7A', 'Meta 7B', 'Meta 8',
+    'Meta 8A', 'Meta 8B', 'Meta 10', 'Meta 10A', 'Meta 10B'
+]
+
+
+def mapear_arquivos(pasta=PASTA_DADOS):
+    """Agrupa os CSVs da pasta por tribunal: {sigla: [arquivos]}, na ordem do glob."""
+    tarefas_por_tribunal = defaultdict(list)
+    for f in glob.glob(os.path.join(pasta, "*.csv")):
+        nome_base = os.path.basename(f)
+        sigla = nome_base.replace('teste_', '').replace('.csv', '')
+        tarefas_por_tribunal[sigla].append(f)
+    return tarefas_por_tribunal
+
+
+def calcular_resumo(somas, ramos):
+    """Calcula o resumo numérico direto das somas por tribunal.
+
+    As metas vão para uma matriz float64 pré-alocada (tribunais x metas do
+    resumo, NaN onde a meta não se aplica ao ramo) e o Desempenho Geral, a
+    média das metas que se aplicam, é calculado na última coluna da mesma
+    matriz. O DataFrame fica numérico; o 'NA' só aparece em escrever_resumo().
+    """
+    import numpy as np
+    import pandas as pd
+    from metas.motor import matriz_metas
+
+    # 'Desempenho Geral' não é nome de fórmula: a coluna sai NaN e é preenchida aqui.
+    colunas = COLUNAS_RESUMO[1:] + ['Desempenho Geral']
+    siglas, matriz = matriz_metas(somas, ramos, colunas)
+    metas = matriz[:, :-1]
+    aplicaveis = ~np.isnan(metas)
+    matriz[:, -1] = np.where(aplicaveis, metas, 0).sum(axis=1) / aplicaveis.sum(axis=1)
+
+    df_resumo = pd.DataFrame(matriz, columns=colunas)
+    df_resumo.insert(0, 'sigla_tribunal', siglas)
+    return df_resumo
+
+
+def escrever_resumo(df_resumo, destino='Resumo Metas.CSV'):
+    """Grava o resumo numérico no CSV, com 'NA' nas metas que não se aplicam.
+
+    O 'NA' é só a representação no arquivo: df_resumo não é alterado. A
+    gravação é atômica: quem lê o resumo nunca vê um arquivo pela metade.
+    """
+    temporario = f"{destino}.{os.getpid()}.tmp"
+    df_resumo.to_csv(temporario, sep=';', encoding='utf-8-sig', index=False, na_rep='NA')
+    os.replace(temporario, destino)
+
+
+def graficos_do_resumo(executor=EXECUTOR_PADRAO, workers=None, formato_grafico='png', graficos_por_ramo=False,
+                       caminho_resumo='Resumo Metas.CSV'):
+    """Gera os gráficos sob demanda a partir do resumo salvo, sem recalcular as metas.
+
+    Os ramos dos gráficos por ramo vêm da primeira linha de um arquivo de cada
+    tribunal em Dados/.
+    """
+    start_time = time.time()
+    if not os.path.exists(caminho_resumo):
+        print(f"Erro: O arquivo '{caminho_resumo}' não foi encontrado. Rode o cálculo das metas antes.")
+        return
+    cor_grafico = APRESENTACAO[executor][2]
+    ramos = ler_ramos(mapear_arquivos(PASTA_DADOS)) if graficos_por_ramo else None
+    trabalhos = trabalhos_de_graficos(ler_resumo(caminho_resumo), cor_grafico, formato_grafico, ramos)
+    for arquivo in aguardar_graficos(iniciar_graficos(trabalhos, executor, workers)):
+        print(f"O gráfico '{arquivo}' foi criado com sucesso.")
+    print(f"\nGráficos gerados em {time.time() - start_time:.4f} segundos.")
+
+
+def executar(executor=EXECUTOR_PADRAO, workers=None, streaming=False, tamanho_bloco=TAMANHO_BLOCO_PADRAO,
+             usar_cache=False, rebuild_cache=False, pasta_cache=PASTA_CACHE_PADRAO,
+             limite_cache_mb=LIMITE_CACHE_PADRAO // 1024 ** 2, incremental=False, caminho_estado=ESTADO_PADRAO,
+             partes_nos_workers=False, balanceado=False, apenas_metas=False, relatorio=None, formato_saida='csv',
+             sem_grafico=False, formato_grafico='png', graficos_por_ramo=False,
+             periodo=None, caminho_historico=HISTORICO_PADRAO, caminho_indice=INDICE_PADRAO,
+             relatorio_qualidade=None, timeout=None, tentativas=TENTATIVAS_PADRAO,
+             tarefas_por_worker=TAREFAS_POR_WORKER_PADRAO):
+    """Roda os quatro passos (mapeamento, cálculo, saídas e gráfico) com o executor escolhido.
+
+    Os gráficos são disparados assim que as metas ficam prontas e renderizados
+    em segundo plano durante o Passo 3; o Passo 4 só espera o que faltar. Com
+    sem_grafico o Passo 4 é pulado e matplotlib nunca é importado. Com periodo,
+    os numeradores e denominadores das metas são gravados no histórico. O
+    índice arquivo -> tribunal/ramo das consultas é regravado ao fim do Passo 2.
+    Com relatorio_qualidade, os workers contam células nulas e inválidas,
+    colunas ausentes e ramos misturados durante a própria leitura e o
+    relatório JSON sai junto com o resumo.
+
+    No Passo 2 cada tarefa tem até `tentativas` execuções de no máximo
+    `timeout` segundos (ver metas.executores.Tolerante) e cada processo é
+    reciclado a cada `tarefas_por_worker` tarefas. Os tribunais que falham de
+    vez são listados e ficam fora das saídas; os demais seguem normalmente.
+
+    Retorna o resumo numérico (ver calcular_resumo), o mesmo usado no gráfico
+    e gravado no 'Resumo Metas.CSV', ou None se não houver dados.
+    """
+    start_time = time.time()
+    descricao, nome_execucao, cor_grafico = APRESENTACAO[executor]
+    workers = workers or os.cpu_count()
+
+    data_path = PASTA_DADOS
+    if not os.path.exists(data_path) or not os.listdir(data_path):
+         print(f"Erro: A pasta '{data_path}' não foi encontrada ou está vazia.")
+         return
+    # Só depois da validação: a pasta dos registros brutos é apagada ao gerar cada relatório.
+    if relatorio:
+        ativar()
+    if relatorio_qualidade:
+        ativar_qualidade()
+
+    import pandas as pd
+    from metas.motor import combinar_somas, componentes_metas
+    from metas.historico import gravar_periodo
+    from metas.indice import atualizar_indice
+    from metas.cache import leitor_csv, limpar_cache
+    from metas.incremental import (carregar_estado, salvar_estado, tarefas_alteradas, somar_tarefa, registrar,
+                                    somas_do_estado, impressao_digital)
+    from metas.agendador import executar_balanceado
+    from metas.blocos import cabecalho_do_tribunal
+    from metas.saida import Saida, tipos_do_concat
+    from metas.tarefas import processar_arquivos_do_tribunal, processar_tribunal_em_blocos, somar_tribunal_mapeado
+
+    saida = Saida.criar(formato_saida)
+
+    if rebuild_cache:
+        limpar_cache(pasta_cache)
+    ler = leitor_csv(usar_cache, pasta_cache, limite_cache_mb * 1024 ** 2)
+
+    print("Passo 1: Mapeando arquivos para cada tribunal...")
+    with etapa('mapeamento') as medida:
+        tarefas_por_tribunal = mapear_arquivos(data_path)
+        all_files = [f for arquivos in tarefas_por_tribunal.values() for f in arquivos]
+        medida['linhas'] = len(all_files)
+    lista_de_tarefas = list(tarefas_por_tribunal.items())
+
+    print(f"{len(lista_de_tarefas)} tribunais encontrados para processar.")
+    print(f"\nPasso 2: Executando leitura e cálculo {descricao}...")
+
+    somas_parciais = []
+    lista_dfs_consolidados = []
+    com_partes = not incremental and not apenas_metas and (streaming or partes_nos_workers or balanceado)
+    if incremental:
+        # Só os tribunais com arquivos alterados vão para o executor; os demais vêm das somas salvas.
+        estado = carregar_estado(caminho_estado)
+        lista_de_tarefas = tarefas_alteradas(tarefas_por_tribunal, estado)
+        print(f"  {len(lista_de_tarefas)} tribunal(is) com arquivos novos ou alterados.")
+    elif com_partes:
+        # Cada worker grava sua parte do consolidado; o pai só junta os bytes no Passo 3.
+        pasta_partes = tempfile.TemporaryDirectory(prefix='consolidado_', dir='.')
+        saida.preparar()
+        colunas, partes = [], []
+    # Sem tarefas (modo incremental sem alterações) não vale a pena subir um pool.
+    pool = Tolerante(executor if lista_de_tarefas else 'sequential', workers, timeout, tentativas, tarefas_por_worker)
+    falhas = []
+    try:
+        with pool:
+            if com_partes:
+                # Os cabeçalhos também são lidos pelo executor: um arquivo travado ou
+                # corrompido tira só o seu tribunal da execução.
+                cabecalhos = pool.map(cabecalho_do_tribunal, lista_de_tarefas)
+                falhas += pool.falhas
+                lista_de_tarefas = [tarefa for tarefa, c in zip(lista_de_tarefas, cabecalhos) if c is not None]
+                colunas = list(dict.fromkeys(coluna for c in cabecalhos if c is not None for coluna in c))
+                partes = [os.path.join(pasta_partes.name, f"{sigla}.csv") for sigla, _ in lista_de_tarefas]
+                tarefas_em_blocos = [(sigla, arquivos, colunas, parte, tamanho_bloco, saida)
+                                     for (sigla, arquivos), parte in zip(lista_de_tarefas, partes)]
+            if incremental:
+                # Um tribunal que falhou sai do estado, e a próxima execução o relê. A impressão
+                # digital é tomada antes da leitura: um arquivo alterado durante ela é relido depois.
+                digitais = [impressao_digital(arquivos) for _, arquivos in lista_de_tarefas]
+                resultados = pool.map(partial(somar_tarefa, ler=ler), lista_de_tarefas)
+                for (sigla, arquivos), resultado, digital in zip(lista_de_tarefas, resultados, digitais):
+                    registrar(estado, sigla, arquivos, None if resultado is None else resultado[1], digital)
+                salvar_estado(estado, caminho_estado)
+                somas_parciais = [somas_do_estado(estado, tarefas_por_tribunal)]
+            elif apenas_metas:
+                # Sem consolidado: cada arquivo é somado direto do mmap, sem DataFrame.
+                somas_parciais = [s for s in pool.map(somar_tribunal_mapeado, lista_de_tarefas) if s is not None]
+            elif balanceado:
+                # Subtarefas de custo parecido, maiores primeiro; as somas voltam na ordem original.
+                somas_parciais, partes = executar_balanceado(lista_de_tarefas, pool, workers, ler, colunas, pasta_partes.name, saida)
+            elif streaming:
+                somas_parciais = [s for s in pool.map(processar_tribunal_em_blocos, tarefas_em_blocos) if s is not None]
+            elif partes_nos_workers:
+                worker = partial(processar_arquivos_do_tribunal, ler=ler, colunas=colunas,
+                                 pasta_partes=pasta_partes.name, saida=saida)
+                somas_parciais = [r[0] for r in pool.map(worker, lista_de_tarefas) if r is not None and r[0] is not None]
+            else:
+                resultados_processamento = pool.map(partial(processar_arquivos_do_tribunal, ler=ler), lista_de_tarefas)
+                for resultado in resultados_processamento:
+                    if resultado is None: continue
+                    res_somas, res_df = resultado
+                    if res_somas is not None: somas_parciais.append(res_somas)
+                    if res_df is not None: lista_dfs_consolidados.append(res_df)
+            if com_partes and not balanceado:
+                # A parte de um tribunal que falhou pode ter ficado pela metade; no modo balanceado o agendador já a descartou.
+                for falha in pool.falhas:
+                    saida.descartar_parte(partes[falha.indice])
+            falhas += pool.falhas
+    except Exception as e:
+        print(f"Ocorreu um erro durante o processamento: {e}")
+
+    tribunais_com_falha = sorted({falha.tribunal for falha in falhas})
+    if falhas:
+        print(f"Aviso: {len(tribunais_com_falha)} tribunal(is) com falha ficaram fora das saídas: "
+              f"{', '.join(tribunais_com_falha)}.")
+        for falha in falhas:
+            print(f"  - {falha.tribunal}: {falha.motivo} ({falha.tentativas} tentativa(s))")
+
+    with etapa('calculo_metas') as medida:
+        somas, ramos = combinar_somas(somas_parciais)
+        df_resumo = calcular_resumo(somas, ramos)
+        medida['linhas'] = len(df_resumo)
+    atualizar_indice(tarefas_por_tribunal, ramos.to_dict(), caminho_indice)
+
+    print("Transformação concluída.")
+
+    # O gráfico sai do caminho crítico: renderiza enquanto o Passo 3 grava os CSVs.
+    graficos = None
+    if not sem_grafico and not df_resumo.empty:
+        pares = list(zip(df_resumo['sigla_tribunal'], df_resumo['Desempenho Geral'].tolist()))
+        trabalhos = trabalhos_de_graficos(pares, cor_grafico, formato_grafico,
+                                          ramos.to_dict() if graficos_por_ramo else None)
+        graficos = iniciar_graficos(trabalhos, executor, workers)
+
+    print("\nPasso 3: Gerando arquivos de saída...")
+    if incremental:
+        print(f"Modo incremental: o arquivo '{saida.destino}' não é regerado.")
+    elif apenas_metas:
+        print(f"Modo só metas: o arquivo '{saida.destino}' não é gerado.")
+    elif com_partes:
+        with etapa('escrita_consolidado'):
+            saida.juntar_partes(partes, colunas)
+        pasta_partes.cleanup()
+        print(f"O arquivo '{saida.destino}' foi criado com sucesso.")
+    elif lista_dfs_consolidados:
+        with etapa('escrita_consolidado') as medida:
+            # Cada tribunal vai direto para o escritor, sem concat; os tipos seguem os do consolidado inteiro.
+            colunas = list(dict.fromkeys(coluna for df in lista_dfs_consolidados for coluna in df.columns))
+            tipos = tipos_do_concat(lista_dfs_consolidados, colunas)
+            medida['linhas'] = 0
+            with saida.abrir(colunas) as escritor:
+                for i, df in enumerate(lista_dfs_consolidados):
+                    lista_dfs_consolidados[i] = None
+                    escritor.escrever(df.astype({c: t for c, t in tipos.items() if c in df.columns}))
+                    medida['linhas'] += len(df)
+        print(f"O arquivo '{saida.destino}' foi criado com sucesso.")
+    else:
+        print(f"Aviso: Nenhum dado foi lido, arquivo '{saida.destino}' não gerado.")
+
+    if not df_resumo.empty:
+        with etapa('escrita_resumo'):
+            escrever_resumo(df_resumo)
+        print("O arquivo 'Resumo Metas.CSV' foi criado com sucesso.")
+    else:
+        print("Aviso: Nenhum resultado foi calculado. O arquivo 'Resumo Metas.CSV' não será gerado.")
+
+    if periodo and not df_resumo.empty:
+        with etapa('historico') as medida:
+            medida['linhas'] = gravar_periodo(componentes_metas(somas, ramos), periodo, caminho_historico)
+        print(f"O período '{periodo}' foi gravado no histórico '{caminho_historico}'.")
+
+    if relatorio_qualidade:
+        with etapa('qualidade'):
+            totais = gerar_relatorio_qualidade(relatorio_qualidade, componentes_metas(somas, ramos))['totais']
+        print(f"Qualidade: {totais['celulas_invalidas']} célula(s) inválida(s) e {totais['celulas_nulas']} nula(s) "
+              f"em {totais['linhas']} linhas; {totais['denominadores_negativos']} denominador(es) negativo(s); "
+              f"{len(totais['tribunais_com_ramos_misturados'])} tribunal(is) com ramos misturados. "
+              f"Relatório gravado em '{relatorio_qualidade}'.")
+
+    print("\nPasso 4: Gerando o gráfico de comparação...")
+    if sem_grafico:
+        print("Gráfico desativado (--sem-grafico).")
+    elif graficos is not None:
+        try:
+            with etapa('grafico'):
+                arquivos_graficos = aguardar_graficos(graficos)
+            for graph_filename in arquivos_graficos:
+                print(f"O gráfico '{graph_filename}' foi criado com sucesso.")
+        except Exception as e:
+            print(f"Erro ao gerar o gráfico: {e}")
+    else:
+        print("Não foi possível gerar o gráfico, pois não há dados válidos de Desempenho Geral.")
+
+    end_time = time.time()
+    print(f"\nExecução {nome_execucao} concluída em {end_time - start_time:.4f} segundos.")
+    if relatorio:
+        gerar_relatorio(relatorio, end_time - start_time, {
+            'executor': executor, 'workers': workers, 'streaming': streaming, 'formato_saida': formato_saida,
+            'cache': usar_cache, 'incremental': incremental, 'partes_nos_workers': partes_nos_workers,
+            'balanceado': balanceado, 'apenas_metas': apenas_metas, 'sem_grafico': sem_grafico,
+            'formato_grafico': formato_grafico, 'graficos_por_ramo': graficos_por_ramo, 'periodo': periodo,
+            'qualidade': bool(relatorio_qualidade), 'timeout': timeout, 'tentativas': tentativas,
+            'tarefas_por_worker': tarefas_por_worker,
+            'tribunais_com_falha': tribunais_com_falha,
+        })
+        print(f"Relatório de execução gravado em '{relatorio}'.")
+    return df_resumo
@@ -0,0 +1,154 @@
+"""Contadores de qualidade dos dados, calculados na mesma leitura das metas.
+
+Onde as células das metas são convertidas para número (aplicar_esquema,
+coagir_colunas e a leitura mapeada), cada tribunal também conta, por
+coluna, as células nulas (vazias ou marcadores como 'NA') e as inválidas
+(texto que vira 0), além das linhas sem a coluna e das linhas por valor de
+ramo_justica. Nada é relido: os contadores saem dos mesmos arrays.
+
+Como na instrumentação, tudo só acontece com a qualidade ativa: ativar()
+liga o canal de metas.registros anunciado pela variável de ambiente
+METAS_QUALIDADE, herdada pelos workers, e cada processo anexa a ele seus
+contadores. gerar_relatorio_qualidade() junta os contadores de todos os processos,
+acrescenta os denominadores negativos ou zerados de cada meta (calculados
+das somas, sem dado novo) e grava um relatório JSON compacto.
+"""
+import json
+from collections import Counter, defaultdict
+
+from metas.registros import Canal
+
+VARIAVEL_AMBIENTE = 'METAS_QUALIDADE'
+_CANAL = Canal(VARIAVEL_AMBIENTE, 'qualidade_metas_')
+
+# Marcadores que o leitor do pandas trata como nulo por padrão.
+MARCADORES_NULOS = frozenset([
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null',
+])
+
+
+def ativar():
+    """Liga os contadores para este processo e seus workers; retorna a pasta dos registros."""
+    return _CANAL.ativar()
+
+
+def desativar():
+    """Desliga os contadores e apaga os registros brutos."""
+    _CANAL.desativar()
+
+
+def ativa():
+    return _CANAL.ativo()
+
+
+def novo_registro():
+    return {'linhas': 0, 'nulas': Counter(), 'invalidas': Counter(), 'ausentes': Counter(), 'ramos': Counter()}
+
+
+def registrar(contagens):
+    """Anexa {sigla: registro} aos registros deste processo (sem efeito com a qualidade inativa)."""
+    if contagens:
+        _CANAL.anexar({'tribunal': str(sigla), **registro} for sigla, registro in contagens.items())
+
+
+def contar_celulas(siglas, originais, convertidos):
+    """Conta nulas e inválidas por tribunal nas colunas convertidas e registra.
+
+    siglas é a Series sigla_tribunal; originais e convertidos mapeiam cada
+    coluna para os valores lidos e os convertidos por pd.to_numeric (antes
+    do fillna). Colunas já numéricas no leitor só têm nulas.
+    """
+    import pandas as pd
+
+    contagens = defaultdict(novo_registro)
+    chaves = siglas.astype(object).to_numpy()
+    for coluna, valores in originais.items():
+        if pd.api.types.is_numeric_dtype(valores):
+            nulas, invalidas = valores.isna(), None
+        else:
+            texto = valores.astype(object)
+            nulas = texto.isna() | texto.isin(MARCADORES_NULOS)
+            invalidas = convertidos[coluna].isna() & ~nulas
+        for nome, mascara in (('nulas', nulas), ('invalidas', invalidas)):
+            if mascara is None or not mascara.any():
+                continue
+            for sigla, quantidade in Counter(chaves[mascara.to_numpy()]).items():
+                if isinstance(sigla, str):
+                    contagens[sigla][nome][coluna] += quantidade
+    registrar(contagens)
+
+
+def contar_linhas(df, ausentes):
+    """Registra, por tribunal, as linhas, as linhas por ramo_justica e as linhas sem as colunas `ausentes`."""
+    contagens = defaultdict(novo_registro)
+    siglas = df['sigla_tribunal'].astype(object)
+    ramos = df['ramo_justica'].astype(object) if 'ramo_justica' in df.columns else None
+    for sigla, quantidade in siglas.value_counts(sort=False).items():
+        contagens[sigla]['linhas'] += int(quantidade)
+        for coluna in ausentes:
+            contagens[sigla]['ausentes'][coluna] += int(quantidade)
+    if ramos is not None:
+        for (sigla, ramo), quantidade in Counter(zip(siglas, ramos)).items():
+            if isinstance(sigla, str) and isinstance(ramo, str):
+                contagens[sigla]['ramos'][ramo] += quantidade
+    registrar(contagens)
+
+
+def _juntar(registros):
+    tribunais = defaultdict(novo_registro)
+    for registro in registros:
+        destino = tribunais[registro['tribunal']]
+        destino['linhas'] += registro['linhas']
+        for campo in ('nulas', 'invalidas', 'ausentes', 'ramos'):
+            destino[campo].update(registro[campo])
+    return tribunais
+
+
+def gerar_relatorio_qualidade(destino, componentes=()):
+    """Junta os contadores de todos os processos em destino (JSON), desliga a qualidade e retorna o relatório.
+
+    componentes são as tuplas de motor.componentes_metas(), de onde saem os
+    denominadores negativos e zerados. Por tribunal, só os contadores não
+    nulos entram no relatório.
+    """
+    tribunais = _juntar(_CANAL.ler())
+
+    denominadores = defaultdict(lambda: {'negativos': [], 'zerados': []})
+    for sigla, _, meta, _, denominador, _ in componentes:
+        if denominador < 0:
+            denominadores[str(sigla)]['negativos'].append(meta)
+        elif denominador == 0:
+            denominadores[str(sigla)]['zerados'].append(meta)
+
+    por_tribunal = {}
+    for sigla in list(tribunais) + [s for s in denominadores if s not in tribunais]:
+        registro = tribunais[sigla]
+        resumo = {'linhas': registro['linhas']}
+        for campo in ('nulas', 'invalidas', 'ausentes'):
+            if registro[campo]:
+                resumo[campo] = dict(registro[campo])
+        if len(registro['ramos']) > 1:
+            resumo['ramos_misturados'] = dict(registro['ramos'])
+        for campo in ('negativos', 'zerados'):
+            if sigla in denominadores and denominadores[sigla][campo]:
+                resumo[f'denominadores_{campo}'] = denominadores[sigla][campo]
+        por_tribunal[sigla] = resumo
+
+    relatorio = {
+        'totais': {
+            'tribunais': len(por_tribunal),
+            'linhas': sum(r['linhas'] for r in por_tribunal.values()),
+            'celulas_nulas': sum(sum(r.get('nulas', {}).values()) for r in por_tribunal.values()),
+            'celulas_invalidas': sum(sum(r.get('invalidas', {}).values()) for r in por_tribunal.values()),
+            'tribunais_com_colunas_ausentes': sorted(s for s, r in por_tribunal.items() if 'ausentes' in r),
+            'tribunais_com_ramos_misturados': sorted(s for s, r in por_tribunal.items() if 'ramos_misturados' in r),
+            'denominadores_negativos': sum(len(r.get('denominadores_negativos', [])) for r in por_tribunal.values()),
+            'denominadores_zerados': sum(len(r.get('denominadores_zerados', [])) for r in por_tribunal.values()),
+        },
+        'tribunais': por_tribunal,
+    }
+    with open(destino, 'w', encoding='utf-8') as f:
+        json.dump(relatorio, f, ensure_ascii=False, indent=2)
+    desativar()
+    return relatorio
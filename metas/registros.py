@@ -0,0 +1,55 @@
+"""Registros brutos gravados pelos workers numa pasta compartilhada, em JSONL.
+
+A instrumentação e a qualidade usam o mesmo canal: ativar() cria uma pasta
+temporária e a anuncia por uma variável de ambiente, herdada pelos workers
+do multiprocessing; cada thread de cada processo anexa seus registros a
+<pasta>/<pid>-<thread>.jsonl e ler() junta os de todos. Com o canal
+inativo, anexar() não faz nada.
+"""
+import json
+import os
+import shutil
+import tempfile
+import threading
+
+
+class Canal:
+    """Canal de registros anunciado pela variável de ambiente `variavel`."""
+
+    def __init__(self, variavel, prefixo):
+        self.variavel, self.prefixo = variavel, prefixo
+
+    def ativar(self):
+        """Liga o canal para este processo e seus workers; retorna a pasta dos registros."""
+        pasta = tempfile.mkdtemp(prefix=self.prefixo)
+        os.environ[self.variavel] = pasta
+        return pasta
+
+    def desativar(self):
+        """Desliga o canal e apaga os registros brutos."""
+        pasta = os.environ.pop(self.variavel, None)
+        if pasta:
+            shutil.rmtree(pasta, ignore_errors=True)
+
+    def ativo(self):
+        return self.variavel in os.environ
+
+    def anexar(self, registros):
+        """Anexa os registros (dicionários) ao arquivo desta thread, se o canal estiver ativo."""
+        pasta = os.environ.get(self.variavel)
+        if pasta is None:
+            return
+        # Um arquivo por thread: com o executor de threads, vários workers dividem o pid.
+        with open(os.path.join(pasta, f"{os.getpid()}-{threading.get_ident()}.jsonl"), 'a', encoding='utf-8') as f:
+            for registro in registros:
+                f.write(json.dumps(registro, ensure_ascii=False) + '\n')
+
+    def ler(self):
+        """Todos os registros anexados por todos os processos, em ordem de arquivo."""
+        pasta = os.environ.get(self.variavel)
+        registros = []
+        if pasta and os.path.isdir(pasta):
+            for nome in sorted(os.listdir(pasta)):
+                with open(os.path.join(pasta, nome), encoding='utf-8') as f:
+                    registros.extend(json.loads(linha) for linha in f if linha.strip())
+        return registros
@@ -0,0 +1,176 @@
+"""Escrita do consolidado em CSV simples, CSV comprimido (gzip/zstd) ou Parquet particionado.
+
+Os escritores recebem o consolidado em lotes (um arquivo, um bloco ou a
+fatia de um worker), sem exigir o DataFrame inteiro em memória. Os formatos
+CSV aceitam arquivos-parte escritos em paralelo: cada parte é um CSV sem
+cabeçalho (ou um membro gzip / frame zstd completo) e o destino final é
+montado juntando os bytes depois do cabeçalho. No Parquet cada lote vira
+arquivos próprios de um dataset particionado por ramo_justica e
+sigla_tribunal; cada parte é um dataset separado, cujos arquivos são
+movidos para o destino ao juntar. Assim, nos dois casos, reescrever uma
+parte (nova tentativa de uma tarefa) ou descartá-la não deixa linhas
+duplicadas nem pela metade no consolidado.
+"""
+import gzip
+import os
+import shutil
+import uuid
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from metas.motor import COLUNAS_METAS
+from metas.padroes import FORMATOS_SAIDA
+
+COLUNAS_PARTICAO = ['ramo_justica', 'sigla_tribunal']
+
+
+def _abrir_texto(caminho, formato, encoding):
+    if formato == 'csv':
+        return open(caminho, 'w', encoding=encoding, newline='')
+    if formato == 'csv.gz':
+        return gzip.open(caminho, 'wt', encoding=encoding, newline='', compresslevel=6)
+    if formato == 'csv.zst':
+        try:
+            import zstandard
+        except ImportError:
+            raise RuntimeError("O formato 'csv.zst' exige o pacote zstandard (pip install zstandard).")
+        return zstandard.open(caminho, 'wt', encoding=encoding, newline='')
+    raise ValueError(f"Formato de saída desconhecido: '{formato}'")
+
+
+def _tabela_parquet(df, colunas):
+    """Normaliza os tipos do lote para que todos os arquivos do dataset tenham o mesmo esquema.
+
+    Contadores das metas viram float64 (inválidos ficam nulos) e as demais
+    colunas viram texto.
+    """
+    import pyarrow as pa
+
+    df = df.reindex(columns=colunas)
+    dados = {}
+    for coluna in colunas:
+        if coluna in COLUNAS_METAS:
+            dados[coluna] = pd.to_numeric(df[coluna], errors='coerce').astype(np.float64)
+        else:
+            dados[coluna] = df[coluna].astype('string')
+    return pa.Table.from_pandas(pd.DataFrame(dados), preserve_index=False)
+
+
+def tipos_do_concat(lotes, colunas):
+    """Colunas que o pd.concat dos lotes deixaria em float64, mesmo inteiras em algum lote.
+
+    Uma coluna numérica vira float64 no concat quando é float em algum lote,
+    quando falta em algum deles (vira NaN) ou quando mistura inteiros com e
+    sem sinal. Converter só essas colunas antes de escrever cada lote dá o
+    mesmo texto ("40.0") do consolidado concatenado; nas demais o texto de
+    cada valor não depende do tipo comum.
+    """
+    tipos = {}
+    for coluna in colunas:
+        presentes = [df[coluna].dtype for df in lotes if coluna in df.columns]
+        if not all(isinstance(t, np.dtype) and t.kind in 'iuf' for t in presentes):
+            continue
+        if len(presentes) < len(lotes) or np.result_type(*presentes).kind == 'f':
+            tipos[coluna] = np.float64
+    return tipos
+
+
+class EscritorConsolidado:
+    """Escreve lotes do consolidado em caminho, no formato dado.
+
+    Com cabecalho=True o arquivo começa com BOM e a linha de cabeçalho, como
+    o Consolidado.csv original; com cabecalho=False só as linhas são
+    escritas, para uso como arquivo-parte. No Parquet, caminho é a pasta do
+    dataset.
+    """
+
+    def __init__(self, caminho, formato='csv', colunas=None, cabecalho=True):
+        self.caminho, self.formato, self.colunas = caminho, formato, colunas
+        self._arquivo = None
+        if formato == 'parquet':
+            os.makedirs(caminho, exist_ok=True)
+            return
+        self._arquivo = _abrir_texto(caminho, formato, 'utf-8-sig' if cabecalho else 'utf-8')
+        if cabecalho:
+            pd.DataFrame(columns=colunas).to_csv(self._arquivo, index=False, sep=';')
+
+    def escrever(self, df):
+        """Anexa um lote (DataFrame) ao destino, com as colunas do consolidado."""
+        if self.formato == 'parquet':
+            import pyarrow.parquet as pq
+
+            pq.write_to_dataset(_tabela_parquet(df, self.colunas), self.caminho, partition_cols=COLUNAS_PARTICAO,
+                                basename_template=f"{uuid.uuid4().hex}-{{i}}.parquet")
+            return
+        df.reindex(columns=self.colunas).to_csv(self._arquivo, header=False, index=False, sep=';')
+
+    def fechar(self):
+        if self._arquivo is not None:
+            self._arquivo.close()
+            self._arquivo = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+
+class Saida(namedtuple('Saida', 'formato destino')):
+    """Formato e destino do consolidado; pode ser enviada aos workers do multiprocessing."""
+
+    __slots__ = ()
+
+    @classmethod
+    def criar(cls, formato='csv', destino=None):
+        if formato not in FORMATOS_SAIDA:
+            raise ValueError(f"Formato de saída desconhecido: '{formato}'")
+        return cls(formato, destino or FORMATOS_SAIDA[formato])
+
+    def preparar(self):
+        """Remove um dataset Parquet anterior, antes que workers comecem a escrever nele."""
+        if self.formato == 'parquet':
+            shutil.rmtree(self.destino, ignore_errors=True)
+            os.makedirs(self.destino, exist_ok=True)
+
+    def abrir(self, colunas):
+        """Escritor do consolidado completo (com cabeçalho)."""
+        if self.formato == 'parquet':
+            self.preparar()
+        return EscritorConsolidado(self.destino, self.formato, colunas, cabecalho=True)
+
+    def abrir_parte(self, caminho_parte, colunas):
+        """Escritor de uma fatia escrita por um worker; reabrir a mesma parte a reescreve do zero."""
+        if self.formato == 'parquet':
+            shutil.rmtree(caminho_parte, ignore_errors=True)
+        return EscritorConsolidado(caminho_parte, self.formato, colunas, cabecalho=False)
+
+    def descartar_parte(self, caminho_parte):
+        """Apaga uma parte (a de uma tarefa que falhou), se ela chegou a ser criada."""
+        if os.path.isdir(caminho_parte):
+            shutil.rmtree(caminho_parte, ignore_errors=True)
+        elif os.path.exists(caminho_parte):
+            os.remove(caminho_parte)
+
+    def juntar_partes(self, partes, colunas):
+        """Monta o destino a partir das partes: cabeçalho seguido dos bytes de cada parte, em ordem.
+
+        No Parquet os arquivos de cada parte são movidos para o dataset de destino.
+        """
+        if self.formato == 'parquet':
+            for parte in partes:
+                for pasta, _, arquivos in os.walk(parte):
+                    relativa = os.path.relpath(pasta, parte)
+                    for arquivo in arquivos:
+                        os.makedirs(os.path.join(self.destino, relativa), exist_ok=True)
+                        os.replace(os.path.join(pasta, arquivo), os.path.join(self.destino, relativa, arquivo))
+            return
+        EscritorConsolidado(self.destino, self.formato, colunas, cabecalho=True).fechar()
+        with open(self.destino, 'ab') as destino:
+            for parte in partes:
+                if not os.path.exists(parte):
+                    continue
+                with open(parte, 'rb') as origem:
+                    shutil.copyfileobj(origem, destino)
@@ -0,0 +1,90 @@
+"""Funções executadas nos workers do pipeline, uma tarefa por tribunal.
+
+Ficam fora de metas.pipeline para que o processo principal só importe
+pandas e o motor quando há dados para processar, e para que os workers
+nunca carreguem matplotlib: o gráfico é gerado só no processo principal.
+
+Os erros de leitura não são tratados aqui: sobem para o executor do
+pipeline (metas.executores.Tolerante), que repete a tarefa e, se ela falhar
+de vez, relata o tribunal e o deixa fora das saídas.
+"""
+import os
+
+import pandas as pd
+
+from metas.instrumentacao import etapa
+from metas.motor import somar_por_tribunal, resolver_ramo, combinar_somas
+from metas.ingestao import ler_csv
+from metas.blocos import somar_em_blocos
+from metas.mapeada import somar_csv
+from metas.saida import Saida
+
+
+# --- WORKER POR TRIBUNAL ---
+def processar_arquivos_do_tribunal(tarefa, ler=ler_csv, colunas=None, pasta_partes=None, saida=None):
+    """Lê e soma os arquivos de um tribunal.
+
+    Com pasta_partes, o próprio worker grava sua fatia do consolidado em
+    <pasta_partes>/<sigla>.csv e só as somas voltam pelo pool. A fatia sai
+    com os tipos inferidos neste tribunal: o modo padrão, que vê todos os
+    tribunais, ainda converte para float as colunas fracionárias em algum
+    deles (ver metas.saida.tipos_do_concat).
+    """
+    if saida is None:
+        saida = Saida.criar()
+    sigla_tribunal, lista_arquivos = tarefa
+    with etapa('leitura', sigla_tribunal, lista_arquivos) as medida:
+        df_list = [ler(file) for file in lista_arquivos]
+        if not df_list: return None, None
+        df_tribunal = pd.concat(df_list, ignore_index=True)
+        medida['linhas'] = len(df_tribunal)
+    if df_tribunal.empty:
+        return None, None
+    ramo = df_tribunal['ramo_justica'].iloc[0]
+    if resolver_ramo(ramo, sigla_tribunal) is not None:
+        print(f"  - Processando: {sigla_tribunal} (Lendo {len(lista_arquivos)} arquivo(s))")
+        with etapa('soma', sigla_tribunal) as medida:
+            somas = somar_por_tribunal(df_tribunal)
+            medida['linhas'] = len(df_tribunal)
+        # Só as somas por coluna voltam para o cálculo vetorizado no processo principal.
+        if pasta_partes is not None:
+            with etapa('escrita_parte', sigla_tribunal) as medida, \
+                    saida.abrir_parte(os.path.join(pasta_partes, f"{sigla_tribunal}.csv"), colunas) as escritor:
+                escritor.escrever(df_tribunal)
+                medida['linhas'] = len(df_tribunal)
+            return somas, None
+        return somas, df_tribunal
+    else:
+        print(f"    - Aviso: Nenhuma função de cálculo definida para '{ramo}'. Tribunal '{sigla_tribunal}' ignorado.")
+        return None, None
+
+# --- WORKER DO MODO STREAMING ---
+def processar_tribunal_em_blocos(tarefa):
+    """Soma o tribunal bloco a bloco e grava sua fatia do consolidado em um arquivo-parte."""
+    sigla_tribunal, lista_arquivos, colunas, caminho_parte, tamanho_bloco, saida = tarefa
+
+    def filtro_ramo(ramo, sigla):
+        if resolver_ramo(ramo, sigla_tribunal) is None:
+            print(f"    - Aviso: Nenhuma função de cálculo definida para '{ramo}'. Tribunal '{sigla_tribunal}' ignorado.")
+            return False
+        print(f"  - Processando: {sigla_tribunal} (Lendo {len(lista_arquivos)} arquivo(s) em blocos)")
+        return True
+
+    with etapa('leitura_em_blocos', sigla_tribunal, lista_arquivos), \
+            saida.abrir_parte(caminho_parte, colunas) as escritor:
+        return somar_em_blocos(lista_arquivos, tamanho_bloco, escritor, filtro_ramo)
+
+# --- WORKER DO MODO SÓ METAS ---
+def somar_tribunal_mapeado(tarefa):
+    """Soma as metas de um tribunal pela leitura mapeada, sem DataFrame nem consolidado."""
+    sigla_tribunal, lista_arquivos = tarefa
+    with etapa('leitura_mapeada', sigla_tribunal, lista_arquivos):
+        somas, ramos = combinar_somas([somar_csv(arquivo) for arquivo in lista_arquivos])
+    if ramos.empty:
+        return None
+    ramo = ramos.iloc[0]
+    if resolver_ramo(ramo, sigla_tribunal) is None:
+        print(f"    - Aviso: Nenhuma função de cálculo definida para '{ramo}'. Tribunal '{sigla_tribunal}' ignorado.")
+        return None
+    print(f"  - Processando: {sigla_tribunal} (Lendo {len(lista_arquivos)} arquivo(s) mapeados em memória)")
+    return somas, ramos
@@ -0,0 +1,113 @@
+"""Modo vigia: processo de longa duração que recalcula as metas quando Dados/ muda.
+
+A cada intervalo a pasta é varrida (polling, sem inotify) e as impressões
+digitais dos CSVs são comparadas com as do estado incremental, que fica
+carregado em memória com as somas de todos os tribunais. Só os tribunais
+com arquivos novos, alterados ou removidos são relidos, pelo mesmo pool que
+fica aberto durante toda a vigia, e o 'Resumo Metas.CSV' é regravado de
+forma atômica.
+
+Um tribunal só é relido quando a impressão digital dos seus arquivos se
+repete em duas varreduras seguidas, para não ler um CSV ainda sendo
+copiado. O estado é salvo a cada atualização, então reiniciar a vigia não
+relê o que já foi somado (é o mesmo arquivo de estado do modo incremental).
+O índice das consultas por sigla e ramo também é regravado a cada atualização.
+As releituras passam pelo executor tolerante do pipeline: um tribunal que
+falha ou trava fica fora do resumo e é tentado de novo nas próximas
+varreduras, sem derrubar a vigia.
+"""
+import os
+import signal
+import time
+
+from metas.executores import EXECUTOR_PADRAO, Tolerante
+from metas.indice import atualizar_indice
+from metas.padroes import PASTA_DADOS, ESTADO_PADRAO, INDICE_PADRAO, TENTATIVAS_PADRAO
+from metas.pipeline import mapear_arquivos, calcular_resumo, escrever_resumo
+
+INTERVALO_PADRAO = 2.0
+
+
+def _encerrar(signum, frame):
+    raise KeyboardInterrupt
+
+
+def _varrer(estado, vistos):
+    """Retorna (tarefas_por_tribunal, tarefas prontas para reler com suas impressões digitais, houve remoção)."""
+    from metas.incremental import impressao_digital, tarefas_alteradas
+
+    tarefas_por_tribunal = mapear_arquivos(PASTA_DADOS)
+    antes = set(estado['tribunais'])
+    alteradas = tarefas_alteradas(tarefas_por_tribunal, estado)
+    removidos = bool(antes - set(estado['tribunais']))
+
+    prontas = []
+    for sigla, arquivos in alteradas:
+        digital = impressao_digital(arquivos)
+        if vistos.get(sigla) == digital:
+            prontas.append((sigla, arquivos, vistos.pop(sigla)))
+        else:
+            vistos[sigla] = digital
+    for sigla in list(vistos):
+        if sigla not in tarefas_por_tribunal:
+            del vistos[sigla]
+    return tarefas_por_tribunal, prontas, removidos
+
+
+def vigiar(executor=EXECUTOR_PADRAO, workers=None, intervalo=INTERVALO_PADRAO, caminho_estado=ESTADO_PADRAO,
+           destino='Resumo Metas.CSV', ciclos=None, caminho_indice=INDICE_PADRAO, timeout=None,
+           tentativas=TENTATIVAS_PADRAO):
+    """Vigia Dados/ até Ctrl+C ou SIGTERM (ou por `ciclos` varreduras) e mantém o resumo atualizado."""
+    from metas.incremental import carregar_estado, salvar_estado, somar_tarefa, registrar, somas_do_estado
+
+    estado = carregar_estado(caminho_estado)
+    vistos = {}
+    ciclo = 0
+    pasta_ausente = False
+    print(f"Modo vigia: verificando '{PASTA_DADOS}' a cada {intervalo:g} s. Ctrl+C para encerrar.")
+    try:
+        with Tolerante(executor, workers, timeout, tentativas) as pool:
+            # SIGTERM (systemd, docker stop) encerra como Ctrl+C; os workers
+            # mantêm o tratamento padrão (ver metas.executores).
+            signal.signal(signal.SIGTERM, _encerrar)
+            while ciclos is None or ciclo < ciclos:
+                if ciclo:
+                    time.sleep(intervalo)
+                ciclo += 1
+
+                # Sem a pasta, nada é descartado do estado: ela pode estar sendo recriada.
+                if not os.path.isdir(PASTA_DADOS):
+                    if not pasta_ausente:
+                        print(f"Aviso: A pasta '{PASTA_DADOS}' não foi encontrada; aguardando.")
+                    pasta_ausente = True
+                    continue
+                pasta_ausente = False
+
+                inicio = time.time()
+                try:
+                    tarefas_por_tribunal, prontas, removidos = _varrer(estado, vistos)
+                except OSError as e:
+                    # Um arquivo sumiu entre o glob e o stat; a próxima varredura resolve.
+                    print(f"Aviso: Varredura interrompida ({e}); nova tentativa em {intervalo:g} s.")
+                    continue
+                if not prontas and not removidos and not (ciclo == 1 and estado['tribunais']):
+                    continue
+
+                resultados = pool.map(somar_tarefa, [(sigla, arquivos) for sigla, arquivos, _ in prontas])
+                for (sigla, arquivos, digital), resultado in zip(prontas, resultados):
+                    registrar(estado, sigla, arquivos, None if resultado is None else resultado[1], digital)
+                for falha in pool.falhas:
+                    print(f"Aviso: Tribunal {falha.tribunal} ficou fora do resumo ({falha.motivo}).")
+                salvar_estado(estado, caminho_estado)
+
+                somas, ramos = somas_do_estado(estado, tarefas_por_tribunal)
+                atualizar_indice(tarefas_por_tribunal, ramos.to_dict(), caminho_indice)
+                df_resumo = calcular_resumo(somas, ramos)
+                if df_resumo.empty:
+                    print("Aviso: Nenhum resultado foi calculado. O resumo anterior foi mantido.")
+                    continue
+                escrever_resumo(df_resumo, destino)
+                print(f"[{time.strftime('%H:%M:%S')}] {len(prontas)} tribunal(is) relido(s); "
+                      f"'{destino}' regravado com {len(df_resumo)} tribunais em {time.time() - inicio:.4f} segundos.")
+    except KeyboardInterrupt:
+        print("\nModo vigia encerrado.")
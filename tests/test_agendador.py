@@ -0,0 +1,63 @@
+"""Testes do fatiamento por faixas de bytes do modo balanceado (metas.agendador)."""
+import os
+
+import pandas as pd
+import pytest
+
+from metas.agendador import ler_faixa, planejar
+from metas.ingestao import ler_csv
+from metas.motor import somar_por_tribunal
+
+CABECALHO = "sigla_tribunal,ramo_justica,julgados_2025,julgm2_a,obs\n"
+LINHAS = [f"TJ{i % 3},Justiça Estadual,{i},{i * 7},\"linha, {i}\"\n" for i in range(5)]
+
+
+def _arquivo(tmp_path, bom=False, newline_final=True):
+    texto = CABECALHO + ''.join(LINHAS)
+    if not newline_final:
+        texto = texto.rstrip('\n')
+    arquivo = tmp_path / 'teste_TJX.csv'
+    arquivo.write_bytes(('﻿' if bom else '').encode('utf-8') + texto.encode('utf-8'))
+    return str(arquivo)
+
+
+def _somas_por_faixas(arquivo, cortes):
+    partes = [ler_faixa(arquivo, inicio, fim) for inicio, fim in zip(cortes, cortes[1:])]
+    df = pd.concat([parte for parte in partes if not parte.empty], ignore_index=True)
+    return somar_por_tribunal(df)
+
+
+def _comparar(arquivo, cortes, esperado=None):
+    somas, ramos = _somas_por_faixas(arquivo, cortes)
+    esperadas, ramos_esperados = esperado or somar_por_tribunal(ler_csv(arquivo))
+    pd.testing.assert_frame_equal(somas.sort_index(), esperadas.sort_index(), check_dtype=False)
+    assert ramos.sort_index().to_dict() == ramos_esperados.sort_index().to_dict()
+
+
+@pytest.mark.parametrize('bom', [False, True])
+@pytest.mark.parametrize('newline_final', [True, False])
+def test_dois_pedacos_em_qualquer_ponto(tmp_path, bom, newline_final):
+    arquivo = _arquivo(tmp_path, bom, newline_final)
+    tamanho = os.path.getsize(arquivo)
+    esperado = somar_por_tribunal(ler_csv(arquivo))
+    # Cortes no meio de linhas, no cabeçalho, no fim de linha e nas pontas.
+    for corte in range(tamanho + 1):
+        _comparar(arquivo, [0, corte, tamanho], esperado)
+
+
+@pytest.mark.parametrize('bom', [False, True])
+@pytest.mark.parametrize('fatias', [3, 7, 50, 400])
+def test_faixas_menores_que_uma_linha(tmp_path, bom, fatias):
+    arquivo = _arquivo(tmp_path, bom, newline_final=False)
+    tamanho = os.path.getsize(arquivo)
+    _comparar(arquivo, [tamanho * i // fatias for i in range(fatias + 1)])
+
+
+def test_planejar_cobre_cada_arquivo_sem_lacunas(tmp_path):
+    arquivo = _arquivo(tmp_path)
+    subtarefas = planejar([('TJX', [arquivo])], workers=4, fatias_por_worker=2, tamanho_minimo=1)
+    assert len(subtarefas) > 1
+    cortes = [subtarefas[0].inicio] + [s.fim for s in subtarefas]
+    assert cortes[0] == 0 and cortes[-1] == os.path.getsize(arquivo)
+    assert all(a.fim == b.inicio for a, b in zip(subtarefas, subtarefas[1:]))
+    _comparar(arquivo, cortes)
@@ -0,0 +1,54 @@
+"""Testes do cache Parquet dos CSVs (metas.cache)."""
+import glob
+import os
+
+import pytest
+
+from metas.cache import PARQUET_DISPONIVEL, _caminho_entrada, leitor_csv, ler_csv_em_cache
+
+pytestmark = pytest.mark.skipif(not PARQUET_DISPONIVEL, reason='o cache exige pyarrow')
+
+
+def _csvs(tmp_path, quantidade=4):
+    arquivos = []
+    for i in range(quantidade):
+        arquivo = tmp_path / f'teste_TJ{i}.csv'
+        linhas = [f"TJ{i},Justiça Estadual,{j},{j * i}" for j in range(200)]
+        arquivo.write_text("sigla_tribunal,ramo_justica,julgados_2025,julgm2_a\n" + '\n'.join(linhas) + '\n',
+                           encoding='utf-8')
+        arquivos.append(str(arquivo))
+    return arquivos
+
+
+def _entradas(pasta):
+    entradas = glob.glob(os.path.join(pasta, '*.parquet'))
+    return len(entradas), sum(os.path.getsize(entrada) for entrada in entradas)
+
+
+def test_limite_vale_ao_gravar(tmp_path):
+    pasta = str(tmp_path / 'cache')
+    arquivos = _csvs(tmp_path)
+    ler_csv_em_cache(arquivos[0], pasta, limite_bytes=1 << 30)
+    tamanho_entrada = _entradas(pasta)[1]
+    for arquivo in arquivos[1:]:
+        ler_csv_em_cache(arquivo, pasta, limite_bytes=2 * tamanho_entrada + tamanho_entrada // 2)
+    assert _entradas(pasta)[0] == 2
+
+
+def test_limite_menor_reduz_cache_quente_ao_iniciar(tmp_path):
+    pasta = str(tmp_path / 'cache')
+    arquivos = _csvs(tmp_path)
+    entradas = []
+    for i, arquivo in enumerate(arquivos):
+        ler_csv_em_cache(arquivo, pasta, limite_bytes=1 << 30)
+        entradas.append(_caminho_entrada(pasta, arquivo))
+        os.utime(entradas[-1], ns=(i * 10 ** 9, i * 10 ** 9))
+    quantidade, total = _entradas(pasta)
+    assert quantidade == len(arquivos)
+
+    # Execução quente: só leituras, nada gravado. O limite menor vale já ao criar o leitor.
+    ler = leitor_csv(True, pasta, limite_bytes=total // 2)
+    assert _entradas(pasta)[1] <= total // 2
+    # As usadas há mais tempo saem primeiro.
+    assert not os.path.exists(entradas[0]) and os.path.exists(entradas[-1])
+    assert ler(arquivos[-1]).shape[0] == 200
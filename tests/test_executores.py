@@ -0,0 +1,70 @@
+"""Testes do executor tolerante a falhas (metas.executores.Tolerante)."""
+import os
+import time
+
+import pytest
+
+from metas.executores import EXECUTORES, Tolerante
+
+TRAVA_S = 3
+
+
+def _tarefa(tarefa):
+    """Tarefa (sigla, acao, valor) do teste; fica no topo do módulo para ir aos processos por pickle."""
+    _, acao, valor = tarefa
+    if acao == 'erro':
+        raise ValueError(f"erro em {valor}")
+    if acao == 'trava':
+        time.sleep(TRAVA_S)
+    if acao == 'erro_uma_vez':
+        # valor é um arquivo-marca: a primeira execução o cria e falha, a segunda passa.
+        if not os.path.exists(valor):
+            open(valor, 'w').close()
+            raise ValueError('primeira tentativa')
+    if acao == 'pid':
+        return os.getpid()
+    return valor
+
+
+@pytest.mark.parametrize('nome', EXECUTORES)
+def test_tarefa_que_falha_de_vez_nao_derruba_as_outras(nome):
+    tarefas = [('TJA', 'ok', 1), ('TJB', 'erro', 2), ('TJC', 'ok', 3)]
+    with Tolerante(nome, workers=2, tentativas=3) as pool:
+        assert pool.map(_tarefa, tarefas) == [1, None, 3]
+        assert [(f.indice, f.tribunal, f.motivo, f.tentativas) for f in pool.falhas] == \
+            [(1, 'TJB', 'ValueError: erro em 2', 3)]
+
+
+@pytest.mark.parametrize('nome', EXECUTORES)
+def test_nova_tentativa_recupera_falha_passageira(nome, tmp_path):
+    tarefas = [('TJA', 'erro_uma_vez', str(tmp_path / 'marca')), ('TJB', 'ok', 2)]
+    with Tolerante(nome, workers=2, tentativas=2) as pool:
+        assert pool.map(_tarefa, tarefas) == [tarefas[0][2], 2]
+        assert pool.falhas == []
+
+
+@pytest.mark.parametrize('nome, tentativas', [('processes', 2), ('threads', 1)])
+def test_tarefa_travada_esgota_o_prazo(nome, tentativas):
+    tarefas = [('TJA', 'ok', 1), ('TJB', 'trava', 2), ('TJC', 'ok', 3), ('TJD', 'ok', 4)]
+    inicio = time.monotonic()
+    with Tolerante(nome, workers=2, timeout=0.5, tentativas=2) as pool:
+        assert pool.map(_tarefa, tarefas) == [1, None, 3, 4]
+        falhas = pool.falhas
+    # Processos repetem a tarefa travada; uma thread presa é abandonada sem nova tentativa.
+    assert [(f.tribunal, f.motivo, f.tentativas) for f in falhas] == [('TJB', 'tempo esgotado (0.5 s)', tentativas)]
+    assert time.monotonic() - inicio < TRAVA_S * tentativas
+
+
+def test_imap_unordered_entrega_so_as_que_completam():
+    tarefas = [('TJA', 'ok', 1), ('TJB', 'erro', 2), ('TJC', 'ok', 3)]
+    with Tolerante('processes', workers=2, tentativas=1) as pool:
+        assert sorted(pool.imap_unordered(_tarefa, tarefas)) == [1, 3]
+        assert [f.tribunal for f in pool.falhas] == ['TJB']
+
+
+def test_processos_sao_reciclados_a_cada_tarefas_por_worker():
+    tarefas = [('TJA', 'pid', None)] * 6
+    with Tolerante('processes', workers=1, maxtasksperchild=2) as pool:
+        pids = pool.map(_tarefa, tarefas)
+    assert pool.falhas == []
+    assert len(set(pids)) == 3
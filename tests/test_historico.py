@@ -0,0 +1,15 @@
+"""Testes do histórico por período (metas.historico)."""
+import pytest
+
+from metas.historico import validar_periodo
+
+
+@pytest.mark.parametrize('periodo', ['2025', '2025-01', '2025-09', '2025-12'])
+def test_periodo_valido(periodo):
+    assert validar_periodo(periodo) == periodo
+
+
+@pytest.mark.parametrize('periodo', ['2025-00', '2025-13', '2025-1', '25', '2025-01\n', '2025/01'])
+def test_periodo_invalido(periodo):
+    with pytest.raises(ValueError, match='Período inválido'):
+        validar_periodo(periodo)
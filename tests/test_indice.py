@@ -0,0 +1,37 @@
+"""Testes do índice arquivo -> tribunal/ramo (metas.indice) e da consulta por ramo."""
+import numpy as np
+
+from metas.consulta import _tarefas
+from metas.indice import atualizar_indice, carregar_indice, salvar_indice, montar_indice
+
+
+def _dados(tmp_path):
+    pasta = tmp_path / 'Dados'
+    pasta.mkdir()
+    for sigla, ramo in [('TJA', 'Justiça Estadual'), ('TJB', 'Justiça Estadual')]:
+        (pasta / f'teste_{sigla}.csv').write_text(
+            f"sigla_tribunal,ramo_justica,julgados_2025\n{sigla},{ramo},1\n", encoding='utf-8')
+    return {'TJA': [str(pasta / 'teste_TJA.csv')], 'TJB': [str(pasta / 'teste_TJB.csv')]}
+
+
+def test_tribunal_sem_ramo_na_execucao_mantem_o_anterior(tmp_path):
+    tarefas = _dados(tmp_path)
+    caminho = str(tmp_path / 'indice.json')
+    salvar_indice(montar_indice(tarefas, {'TJA': 'Justiça Estadual', 'TJB': 'Ramo Antigo'}), caminho)
+    indice = atualizar_indice(tarefas, {'TJA': 'Justiça Estadual', 'TJB': np.nan}, caminho)
+    assert indice['tribunais']['TJB']['ramo'] == 'Ramo Antigo'
+    assert carregar_indice(caminho) == indice
+
+
+def test_tribunal_sem_ramo_e_sem_indice_le_a_primeira_linha(tmp_path):
+    tarefas = _dados(tmp_path)
+    indice = atualizar_indice(tarefas, {'TJA': 'Justiça Estadual'}, str(tmp_path / 'indice.json'))
+    assert indice['tribunais']['TJB']['ramo'] == 'Justiça Estadual'
+
+
+def test_consulta_por_ramo_reindexa_tribunal_sem_ramo(tmp_path, monkeypatch):
+    tarefas = _dados(tmp_path)
+    monkeypatch.chdir(tmp_path)
+    caminho = str(tmp_path / 'indice.json')
+    salvar_indice(montar_indice(tarefas, {'TJA': 'Justiça Estadual'}), caminho)
+    assert sorted(sigla for sigla, _ in _tarefas(None, ['Justiça Estadual'], caminho)) == ['TJA', 'TJB']
@@ -0,0 +1,39 @@
+"""Testes da leitura com o esquema declarado (metas.ingestao)."""
+import pandas as pd
+import pytest
+
+from metas.ingestao import ler_csv, ler_csv_em_blocos, MOTOR_CSV
+from metas.motor import somar_por_tribunal
+
+MOTORES = sorted({'c', MOTOR_CSV})
+
+
+@pytest.mark.parametrize('motor', MOTORES)
+@pytest.mark.parametrize('apenas_metas', [True, False])
+def test_contador_acima_de_int32_nao_da_a_volta(tmp_path, motor, apenas_metas):
+    arquivo = tmp_path / 'teste_TJX.csv'
+    arquivo.write_text(
+        "sigla_tribunal,ramo_justica,julgm2_a,julgados_2025\n"
+        f"TJX,Justiça Estadual,{3_000_000_000},1\n"
+        "TJX,Justiça Estadual,1,2\n",
+        encoding='utf-8')
+    df = ler_csv(str(arquivo), apenas_metas=apenas_metas, motor=motor)
+    somas, _ = somar_por_tribunal(df)
+    assert df['julgm2_a'].tolist() == [3_000_000_000, 1]
+    assert somas.loc['TJX', 'julgm2_a'] == 3_000_000_001
+
+
+def test_contadores_pequenos_continuam_compactos(tmp_path):
+    arquivo = tmp_path / 'teste_TJX.csv'
+    arquivo.write_text("sigla_tribunal,ramo_justica,julgm2_a\nTJX,Justiça Estadual,7\n", encoding='utf-8')
+    assert str(ler_csv(str(arquivo), apenas_metas=True, motor='c')['julgm2_a'].dtype) == 'int32'
+
+
+def test_blocos_de_texto_tratam_nulos_como_a_leitura_inteira(tmp_path):
+    arquivo = tmp_path / 'teste_TJX.csv'
+    arquivo.write_text("sigla_tribunal,ramo_justica,julgm2_a,obs\nTJX,Justiça Estadual,NA,\nTJX,Justiça Estadual,4,x\n",
+                       encoding='utf-8')
+    inteiro = ler_csv(str(arquivo), motor='c')
+    bloco = pd.concat(ler_csv_em_blocos(str(arquivo), 1))
+    assert bloco.isna().to_numpy().tolist() == inteiro.isna().to_numpy().tolist()
+    assert bloco['julgm2_a'].tolist()[1] == '4'
@@ -0,0 +1,77 @@
+"""Testes diferenciais da leitura mapeada (metas.mapeada) contra a leitura com o pandas."""
+import numpy as np
+import pytest
+
+import metas.mapeada as mapeada
+from metas.ingestao import ler_csv
+from metas.mapeada import somar_mapeado, somar_csv
+from metas.motor import somar_por_tribunal
+
+CELULAS = {
+    'sinal': ['-5', '+7', '12'],
+    'inf': ['inf', '3', '4'],
+    'menos_inf': ['-inf', '3', '4'],
+    'mais_inf': ['+inf', '3', '4'],
+    'menos_infinity': ['-Infinity', '3', '4'],
+    'inf_entre_aspas': ['"-inf"', '3', '4'],
+    'na': ['NA', '', '4'],
+    'estouro': ['1' * 20, '3', '4'],
+    'largo_sem_digito': ['x' * 25, '3', '4'],
+    'lixo': ['abc', '12x', '4'],
+    'texto_com_i': ['Ignorado', '3', '4'],
+}
+
+
+def _escrever(tmp_path, celulas):
+    arquivo = tmp_path / 'teste_TJX.csv'
+    linhas = ["sigla_tribunal,ramo_justica,julgados_2025,julgm2_a"]
+    linhas += [f"TJX,Justiça Estadual,{i},{celula}" for i, celula in enumerate(celulas)]
+    arquivo.write_text('\n'.join(linhas) + '\n', encoding='utf-8')
+    return str(arquivo)
+
+
+def _comparar(resultado, esperado):
+    somas, ramos = resultado
+    somas_esperadas, ramos_esperados = esperado
+    np.testing.assert_array_equal(somas.loc['TJX', 'julgm2_a'], somas_esperadas.loc['TJX', 'julgm2_a'])
+    np.testing.assert_array_equal(somas.loc['TJX', 'julgados_2025'], somas_esperadas.loc['TJX', 'julgados_2025'])
+    assert ramos.loc['TJX'] == ramos_esperados.loc['TJX']
+
+
+@pytest.mark.parametrize('caso', sorted(CELULAS))
+def test_mapeada_igual_ao_pandas(tmp_path, caso):
+    arquivo = _escrever(tmp_path, CELULAS[caso])
+    esperado = somar_por_tribunal(ler_csv(arquivo))
+    resultado = somar_mapeado(arquivo)
+    # None é a volta para o pandas; o que sai da leitura mapeada tem de bater com ele.
+    if resultado is not None:
+        _comparar(resultado, esperado)
+    _comparar(somar_csv(arquivo), esperado)
+
+
+def test_erro_no_bloco_nao_vira_buffererror(tmp_path, monkeypatch):
+    arquivo = _escrever(tmp_path, ['1', '2'])
+
+    def falhar(buf, *args, **kwargs):
+        visao = buf[:1]  # noqa: F841 - mantém uma view do mmap no quadro do traceback
+        raise ValueError('falha no bloco')
+
+    monkeypatch.setattr(mapeada, '_somar_bloco', falhar)
+    with pytest.raises(ValueError, match='falha no bloco'):
+        somar_mapeado(arquivo)
+
+
+@pytest.mark.parametrize('bytes_por_bloco', [64, 1 << 20])
+def test_ramo_na_primeira_coluna_com_varios_tribunais(tmp_path, bytes_por_bloco):
+    arquivo = tmp_path / 'teste_TJX.csv'
+    linhas = ["ramo_justica,sigla_tribunal,julgados_2025,julgm2_a"]
+    for i, (ramo, sigla) in enumerate([('Justiça Estadual', 'TJA'), ('Justiça Federal', 'TRF1'),
+                                        ('Justiça do Trabalho', 'TRT2'), ('Justiça Estadual', 'TJA'),
+                                        ('Justiça Eleitoral', 'TRE3')] * 3):
+        linhas.append(f"{ramo},{sigla},{i},{i * 2}")
+    arquivo.write_text('\n'.join(linhas) + '\n', encoding='utf-8')
+    somas_esperadas, ramos_esperados = somar_por_tribunal(ler_csv(str(arquivo)))
+    somas, ramos = somar_mapeado(str(arquivo), bytes_por_bloco=bytes_por_bloco)
+    assert ramos.sort_index().to_dict() == ramos_esperados.sort_index().to_dict()
+    np.testing.assert_array_equal(somas.loc[somas_esperadas.index, ['julgados_2025', 'julgm2_a']],
+                                  somas_esperadas[['julgados_2025', 'julgm2_a']])
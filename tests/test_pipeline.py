@@ -0,0 +1,12 @@
+"""Testes do pipeline completo (metas.pipeline)."""
+import os
+
+from metas import instrumentacao, qualidade
+from metas.pipeline import executar
+
+
+def test_sem_dados_nao_ativa_relatorios(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    assert executar('sequential', relatorio='r.json', relatorio_qualidade='q.json', sem_grafico=True) is None
+    assert instrumentacao.VARIAVEL_AMBIENTE not in os.environ
+    assert qualidade.VARIAVEL_AMBIENTE not in os.environ
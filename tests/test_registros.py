@@ -0,0 +1,23 @@
+"""Testes do canal de registros brutos (metas.registros)."""
+import os
+import threading
+
+from metas.registros import Canal
+
+
+def test_registros_de_varias_threads_sao_lidos_e_apagados(monkeypatch):
+    monkeypatch.delenv('METAS_TESTE_REGISTROS', raising=False)
+    canal = Canal('METAS_TESTE_REGISTROS', 'teste_registros_')
+    canal.anexar([{'x': 0}])
+    assert not canal.ativo() and canal.ler() == []
+
+    pasta = canal.ativar()
+    threads = [threading.Thread(target=canal.anexar, args=([{'x': i}, {'x': i}],)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(registro['x'] for registro in canal.ler()) == [0, 0, 1, 1, 2, 2, 3, 3]
+
+    canal.desativar()
+    assert not canal.ativo() and not os.path.exists(pasta)
@@ -0,0 +1,32 @@
+"""Testes dos escritores do consolidado (metas.saida)."""
+import numpy as np
+import pandas as pd
+
+from metas.saida import Saida, tipos_do_concat
+
+LOTES = [
+    pd.DataFrame({'sigla_tribunal': ['TJA', 'TJA'], 'casos': [40, 41], 'valor': [1, 2], 'so_a': [5, 6],
+                  'flag': [True, False], 'nome': ['x', 'y']}),
+    pd.DataFrame({'sigla_tribunal': ['TJB'], 'casos': [7], 'valor': [2.5], 'extra': ['z'],
+                  'flag': [True], 'nome': [3]}),
+    pd.DataFrame({'sigla_tribunal': ['TJC'], 'casos': np.array([8], dtype=np.uint64), 'valor': [np.nan],
+                  'so_a': [9], 'flag': [False], 'nome': ['w']}),
+]
+
+
+def test_lotes_escritos_um_a_um_igualam_o_concat(tmp_path):
+    esperado = tmp_path / 'concat.csv'
+    df = pd.concat(LOTES, ignore_index=True)
+    with Saida.criar('csv', str(esperado)).abrir(list(df.columns)) as escritor:
+        escritor.escrever(df)
+
+    obtido = tmp_path / 'lotes.csv'
+    colunas = list(dict.fromkeys(coluna for lote in LOTES for coluna in lote.columns))
+    tipos = tipos_do_concat(LOTES, colunas)
+    with Saida.criar('csv', str(obtido)).abrir(colunas) as escritor:
+        for lote in LOTES:
+            escritor.escrever(lote.astype({c: t for c, t in tipos.items() if c in lote.columns}))
+
+    assert colunas == list(df.columns)
+    assert set(tipos) == {'casos', 'valor', 'so_a'}
+    assert obtido.read_bytes() == esperado.read_bytes()